@@ -1,16 +1,37 @@
+from __future__ import annotations
+
 import streamlit as st
-import gspread
-from google.oauth2.service_account import Credentials
+import requests
+import abc
+import asyncio
+import csv
 import json
 import os
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import numpy as np
+import pyarrow as pa
+from pyarrow import feather
 import datetime
 import re
+import urllib.parse
+import hashlib
+import random
+import threading
+import time
+import bisect
+import hmac
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any, Callable, Iterator
+
+# gspread, google-auth and plotly are imported where they are first used, so a
+# cold process paints the header and load button before paying for them
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+    from google.oauth2.service_account import Credentials
 
 # ==================== HELPER FUNCTIONS ====================
 def get_secret(key, default=None):
@@ -24,7 +45,9 @@ def get_secret(key, default=None):
     # (detect by checking if we're not in a typical production environment)
     if not os.getenv("RENDER") and not os.getenv("RAILWAY_ENVIRONMENT") and not os.getenv("VERCEL"):
         try:
-            return st.secrets.get(key, default)
+            # Probe first: reading st.secrets without a secrets.toml renders an st.error
+            if st.secrets.load_if_toml_exists():
+                return st.secrets.get(key, default)
         except Exception:
             pass
     
@@ -36,6 +59,98 @@ class Config:
     SPREADSHEET_ID = get_secret("SPREADSHEET_ID", "1g3XL1EllHoWV3jhmi7gT3at6MtCNTJBo8DQ1WyWhMEo")
     SHEET_NAME = get_secret("SHEET_NAME", "Sheet1")
     
+    # Signal products logged to separate worksheets, as a JSON object mapping the
+    # strategy name to its worksheet (table for sqlite, file path for csv/parquet/fake),
+    # e.g. {"Scalping": "Scalp Log", "Swing": "Swing Log"}; empty loads SHEET_NAME only.
+    # Strategies are fetched and cleaned concurrently on up to STRATEGY_FETCH_WORKERS threads
+    STRATEGIES = json.loads(get_secret("STRATEGIES", "") or "{}")
+    STRATEGY_FETCH_WORKERS = int(get_secret("STRATEGY_FETCH_WORKERS", 8))
+    # Per-view derived caches (aggregates, rolling metrics, render frames) hold every
+    # strategy view plus the combined view and a spare, so a rerun that builds all
+    # of them (the combined page's breakdown does) never evicts its own entries
+    VIEW_CACHE_ENTRIES = max(4, len(STRATEGIES) + 2)
+    
+    # Sheets HTTP client: "async" (pooled session, retries with jittered exponential
+    # backoff, coalesced identical requests, proactive token refresh) or "gspread"
+    SHEETS_CLIENT = str(get_secret("SHEETS_CLIENT", "async")).lower()
+    SHEETS_MAX_RETRIES = int(get_secret("SHEETS_MAX_RETRIES", 5))
+    SHEETS_BACKOFF_BASE = float(get_secret("SHEETS_BACKOFF_BASE", 0.5))
+    SHEETS_BACKOFF_MAX = float(get_secret("SHEETS_BACKOFF_MAX", 32))
+    SHEETS_POOL_SIZE = int(get_secret("SHEETS_POOL_SIZE", 10))
+    SHEETS_TIMEOUT = float(get_secret("SHEETS_TIMEOUT", 30))
+    # Access tokens are refreshed in the background this many seconds before expiry
+    SHEETS_TOKEN_REFRESH_MARGIN = int(get_secret("SHEETS_TOKEN_REFRESH_MARGIN", 300))
+    
+    # Data source: "sheets" (Google Sheets), "csv", "sqlite", "parquet" (local
+    # store at DATA_SOURCE_PATH) or "fake" (local stand-in for load testing)
+    DATA_SOURCE = str(get_secret("DATA_SOURCE", "sheets")).lower()
+    DATA_SOURCE_PATH = get_secret("DATA_SOURCE_PATH", "")
+    DATA_SOURCE_TABLE = get_secret("DATA_SOURCE_TABLE", "signals")
+    DATA_DATE_COLUMN = get_secret("DATA_DATE_COLUMN", "Date")
+    
+    # Only load the last HISTORY_DAYS days of data (0 loads the full history);
+    # pushed down to CSV/SQLite/Parquet sources, applied after cleaning for Sheets
+    HISTORY_DAYS = int(get_secret("HISTORY_DAYS", 0))
+    
+    # Sheets reads fetch only the mapped columns with one unformatted batchGet
+    SHEETS_COLUMN_PROJECTION = str(get_secret("SHEETS_COLUMN_PROJECTION", "true")).lower() == "true"
+    
+    FAKE_SHEET_PATH = get_secret("FAKE_SHEET_PATH", "")
+    FAKE_SHEET_LATENCY = float(get_secret("FAKE_SHEET_LATENCY", 0.0))
+    FAKE_SHEET_LATENCY_JITTER = float(get_secret("FAKE_SHEET_LATENCY_JITTER", 0.0))
+    FAKE_SHEET_ERROR_RATE = float(get_secret("FAKE_SHEET_ERROR_RATE", 0.0))
+    FAKE_SHEET_GROWTH_ROWS = int(get_secret("FAKE_SHEET_GROWTH_ROWS", 0))
+    
+    # Data cache: fresh for DATA_CACHE_TTL seconds, then served stale while a
+    # background refresh runs for up to DATA_CACHE_STALE_TTL more seconds
+    DATA_CACHE_TTL = int(get_secret("DATA_CACHE_TTL", 300))
+    DATA_CACHE_STALE_TTL = int(get_secret("DATA_CACHE_STALE_TTL", 3600))
+    # After a failed refresh, stale reads wait DATA_CACHE_RETRY_BACKOFF seconds (doubled
+    # per consecutive failure, capped at REFRESH_MAX_BACKOFF) before revalidating again
+    DATA_CACHE_RETRY_BACKOFF = int(get_secret("DATA_CACHE_RETRY_BACKOFF", 30))
+    
+    # Incremental sync: fetch only appended rows, re-checking the last
+    # SYNC_OVERLAP_ROWS synced rows, with a full reload every FULL_RESYNC_INTERVAL seconds
+    INCREMENTAL_SYNC = str(get_secret("INCREMENTAL_SYNC", "true")).lower() == "true"
+    SYNC_OVERLAP_ROWS = int(get_secret("SYNC_OVERLAP_ROWS", 5))
+    FULL_RESYNC_INTERVAL = int(get_secret("FULL_RESYNC_INTERVAL", 3600))
+    
+    # Local Feather snapshot of the cleaned data, used on cold starts and
+    # while Google Sheets is unreachable (set to an empty string to disable)
+    SNAPSHOT_PATH = get_secret("SNAPSHOT_PATH", str(Path(__file__).parent / ".cache" / "trading_data.feather"))
+    
+    # Background refresher: polls every REFRESH_INTERVAL seconds (+/- REFRESH_JITTER
+    # fraction), backing off exponentially up to REFRESH_MAX_BACKOFF on errors
+    BACKGROUND_REFRESH = str(get_secret("BACKGROUND_REFRESH", "true")).lower() == "true"
+    REFRESH_INTERVAL = int(get_secret("REFRESH_INTERVAL", 120))
+    REFRESH_JITTER = float(get_secret("REFRESH_JITTER", 0.1))
+    REFRESH_MAX_BACKOFF = int(get_secret("REFRESH_MAX_BACKOFF", 900))
+    
+    # Opt-in font stylesheet imported when no self-hosted font files are found under
+    # static/fonts, e.g. https://fonts.googleapis.com/css2?family=IBM+Plex+Sans:wght@300;400;500;600;700&display=swap
+    # Empty (the default) uses the system font stack, so first paint waits on no external request
+    FONT_IMPORT_URL = get_secret("FONT_IMPORT_URL", "")
+    
+    # Rendered card HTML fragments kept per process, keyed by their values (LRU)
+    HTML_TEMPLATE_CACHE_SIZE = int(get_secret("HTML_TEMPLATE_CACHE_SIZE", 256))
+    
+    # Maximum number of serialized Plotly figures kept per process (LRU)
+    FIGURE_CACHE_SIZE = int(get_secret("FIGURE_CACHE_SIZE", 64))
+    
+    # Charts with more rows than this are downsampled (LTTB for lines,
+    # weekly/monthly buckets for bars); 0 always plots every row
+    CHART_POINT_BUDGET = int(get_secret("CHART_POINT_BUDGET", 500))
+    
+    # Records table rows per page (0 renders the whole period at once); CSV
+    # exports are formatted TABLE_EXPORT_CHUNK_ROWS rows at a time
+    TABLE_PAGE_SIZE = int(get_secret("TABLE_PAGE_SIZE", 50))
+    TABLE_EXPORT_CHUNK_ROWS = int(get_secret("TABLE_EXPORT_CHUNK_ROWS", 50000))
+    
+    # Diagnostics panel shown when the page is opened with ?diagnostics=<token>
+    # (empty disables it); METRICS_TEXTFILE_PATH also writes Prometheus text there
+    DIAGNOSTICS_TOKEN = get_secret("DIAGNOSTICS_TOKEN", "")
+    METRICS_TEXTFILE_PATH = get_secret("METRICS_TEXTFILE_PATH", "")
+    
     # Binance Color Scheme - Enhanced for better readability
     COLORS = {
         'primary': '#F0B90B',      # Binance Yellow
@@ -57,19 +172,20 @@ class Config:
 class StyleManager:
     """Manages all CSS styling for the application"""
     
-    @staticmethod
-    def apply_custom_css():
-        """Apply comprehensive responsive CSS styling with improved readability"""
-        st.markdown("""
-        <style>
-        /* Import Binance-like fonts */
-        @import url('https://fonts.googleapis.com/css2?family=IBM+Plex+Sans:wght@300;400;500;600;700&display=swap');
-        
+    # Optional self-hosted IBM Plex Sans, one static/fonts/IBMPlexSans-<weight>.woff2
+    # per weight, served once server.enableStaticServing is turned on
+    FONT_FAMILY = 'IBM Plex Sans'
+    FONT_FILE = 'IBMPlexSans-{weight}.woff2'
+    FONT_WEIGHTS = (300, 400, 500, 600, 700)
+    STATIC_DIR = Path(__file__).parent / 'static'
+    STATIC_URL = 'app/static'
+    
+    CSS = """
         /* Main app styling with Binance colors */
         .stApp {
             background: #0B0E11;
             color: #FFFFFF;
-            font-family: 'IBM Plex Sans', sans-serif;
+            font-family: 'IBM Plex Sans', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
         }
         
         /* Responsive container */
@@ -98,7 +214,7 @@ class StyleManager:
             -webkit-text-fill-color: transparent;
             margin-bottom: 0.8rem;
             text-shadow: 0 0 30px rgba(240, 185, 11, 0.4);
-            font-family: 'IBM Plex Sans', sans-serif;
+            font-family: 'IBM Plex Sans', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
             line-height: 1.2;
         }
         
@@ -174,7 +290,7 @@ class StyleManager:
             color: #F0B90B;
             margin: 0.5rem 0;
             text-shadow: 0 0 15px rgba(240, 185, 11, 0.3);
-            font-family: 'IBM Plex Sans', sans-serif;
+            font-family: 'IBM Plex Sans', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
             line-height: 1.1;
         }
         
@@ -187,6 +303,12 @@ class StyleManager:
             line-height: 1.3;
         }
         
+        .stat-detail {
+            font-size: clamp(0.75rem, 2vw, 0.9rem);
+            margin-top: 0.5rem;
+            color: #FFFFFF;
+        }
+        
         /* Chart containers - Enhanced */
         .chart-container {
             background: linear-gradient(135deg, #181A20 0%, #1E2329 100%);
@@ -212,7 +334,7 @@ class StyleManager:
             box-shadow: 0 4px 12px rgba(240, 185, 11, 0.3);
             text-transform: uppercase;
             letter-spacing: 0.5px;
-            font-family: 'IBM Plex Sans', sans-serif;
+            font-family: 'IBM Plex Sans', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
             min-height: 48px;
         }
         
@@ -266,8 +388,9 @@ class StyleManager:
         @media (min-width: 768px) {
             .stRadio div[role="radiogroup"] {
                 flex-direction: row;
+                flex-wrap: wrap;
                 justify-content: center;
-                gap: 2rem;
+                gap: 1rem 2rem;
             }
         }
         
@@ -360,7 +483,7 @@ class StyleManager:
         
         h1, h2, h3, h4, h5, h6 {
             color: #F0B90B !important;
-            font-family: 'IBM Plex Sans', sans-serif !important;
+            font-family: 'IBM Plex Sans', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif !important;
             font-size: clamp(1.2rem, 3vw, 1.8rem) !important;
             text-align: center;
             margin-bottom: 1rem !important;
@@ -436,332 +559,2545 @@ class StyleManager:
                 margin: 0 auto;
             }
         }
-        </style>
-        """, unsafe_allow_html=True)
-
-# ==================== DATA MANAGER ====================
-class DataManager:
-    """Handles all data operations including Google Sheets connection"""
+        """
     
-    def __init__(self):
-        self._sheet = None
+    @staticmethod
+    def apply_custom_css():
+        """Apply comprehensive responsive CSS styling with improved readability"""
+        st.markdown(get_stylesheet(), unsafe_allow_html=True)
     
-    @st.cache_resource
-    def connect_to_gsheet(_self):
-        """Establish connection to Google Sheets"""
-        try:
-            credentials_info = _self._get_credentials()
-            credentials = Credentials.from_service_account_info(
-                credentials_info,
-                scopes=[
-                    "https://www.googleapis.com/auth/spreadsheets",
-                    "https://www.googleapis.com/auth/drive",
-                ]
-            )
-            client = gspread.authorize(credentials)
-            sheet = client.open_by_key(Config.SPREADSHEET_ID).worksheet(Config.SHEET_NAME)
-            return sheet
-        except Exception as e:
-            st.error(f"Google Sheets connection error: {str(e)}")
-            raise e
+    @staticmethod
+    def build_stylesheet() -> str:
+        """Font rules and the application CSS as one minified <style> block"""
+        return f"<style>{StyleManager.minify_css(StyleManager.font_css() + StyleManager.CSS)}</style>"
     
-    def _get_credentials(self) -> Dict[str, Any]:
-        """Get Google Sheets credentials – prefer secret files, then ENV (no st.secrets for production)."""
-
-        # 1) Secret Files di Render (recommended untuk production)
-        secret_file_paths = [
-            "/etc/secrets/google_credentials.json",
-            "/etc/secrets/credentials.json", 
-            "/etc/secrets/service_account.json"
-        ]
+    @staticmethod
+    def font_css() -> str:
+        """@font-face rules for self-hosted font files, else the opt-in FONT_IMPORT_URL import
         
-        for file_path in secret_file_paths:
-            try:
-                if os.path.exists(file_path):
-                    print(f"✅ Found secret file: {file_path}")
-                    with open(file_path, 'r') as f:
-                        credentials_data = json.load(f)
-                    print("✅ Successfully loaded credentials from secret file")
-                    return credentials_data
-            except Exception as e:
-                print(f"❌ Error reading secret file {file_path}: {e}")
-
-        # 2) Single JSON in ENV (backup method)
-        cj = get_secret("CREDENTIALS_JSON")
-        if cj:
-            print("✅ Using CREDENTIALS_JSON environment variable")
-            # Hapus quote pembungkus jika ada
-            cj = cj.strip().strip("'").strip('"')
-            return json.loads(cj)
-
-        # 3) Compose from split ENV vars
-        fields = [
-            "type","project_id","private_key_id","private_key","client_email","client_id",
-            "auth_uri","token_uri","auth_provider_x509_cert_url","client_x509_cert_url","universe_domain"
-        ]
-        data = {k: get_secret(k) for k in fields}
-
-        # Normalisasi private_key (ubah \n menjadi newline asli)
-        pk = data.get("private_key")
-        if pk:
-            print("✅ Found private_key in environment variables")
-            # Jika Render menyimpan \n literal, ini akan menjadi baris sebenarnya
-            data["private_key"] = pk.replace("\\n", "\n").strip()
-
-            # Jangan karang header/footer—cukup validasi ada BEGIN/END
-            if "BEGIN PRIVATE KEY" not in data["private_key"] or "END PRIVATE KEY" not in data["private_key"]:
-                raise ValueError("Service account private_key missing BEGIN/END headers.")
-
-        # Set default values for missing optional fields
-        data["type"] = data.get("type") or "service_account"
-        data["auth_uri"] = data.get("auth_uri") or "https://accounts.google.com/o/oauth2/auth"
-        data["token_uri"] = data.get("token_uri") or "https://oauth2.googleapis.com/token"
-        data["auth_provider_x509_cert_url"] = data.get("auth_provider_x509_cert_url") or "https://www.googleapis.com/oauth2/v1/certs"
+        Font URLs carry a content hash so browsers can cache them across deploys.
+        """
+        faces = []
+        if st.get_option('server.enableStaticServing'):
+            for weight in StyleManager.FONT_WEIGHTS:
+                path = StyleManager.STATIC_DIR / 'fonts' / StyleManager.FONT_FILE.format(weight=weight)
+                if not path.is_file():
+                    continue
+                digest = hashlib.sha1(path.read_bytes()).hexdigest()[:12]
+                faces.append(
+                    f"@font-face {{ font-family: '{StyleManager.FONT_FAMILY}'; font-style: normal; "
+                    f"font-weight: {weight}; font-display: swap; "
+                    f"src: url('{StyleManager.STATIC_URL}/fonts/{path.name}?v={digest}') format('woff2'); }}"
+                )
+        if faces:
+            return '\n'.join(faces)
+        return f"@import url('{Config.FONT_IMPORT_URL}');" if Config.FONT_IMPORT_URL else ''
+    
+    @staticmethod
+    def minify_css(css: str) -> str:
+        """Strip comments and the whitespace around CSS punctuation"""
+        css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+        css = re.sub(r'\s+', ' ', css)
+        css = re.sub(r'\s*([{};:,>])\s*', r'\1', css)
+        return css.replace(';}', '}').strip()
+    
+    @staticmethod
+    def minify_html(html: str) -> str:
+        """Drop the line breaks and indentation of an HTML fragment"""
+        return re.sub(r'\s*\n\s*', '', html)
 
-        required = ["type","project_id","private_key","client_email","token_uri"]
-        if all(data.get(k) for k in required):
-            print("✅ Successfully constructed credentials from individual environment variables")
-            # Filter out None values
-            return {k: v for k, v in data.items() if v is not None}
+@st.cache_resource
+def get_stylesheet() -> str:
+    """Minified stylesheet, built once per process"""
+    stylesheet = StyleManager.build_stylesheet()
+    get_metrics().set_gauge('stylesheet_bytes', len(stylesheet))
+    return stylesheet
 
-        # Debug info
-        available_env_vars = [k for k in fields if get_secret(k)]
-        available_secret_files = [f for f in secret_file_paths if os.path.exists(f)]
-        
-        print(f"Available environment variables: {available_env_vars}")
-        print(f"Available secret files: {available_secret_files}")
-        
-        raise ValueError("""
-        Google Sheets credentials not found in any location:
-        1. Secret files: /etc/secrets/google_credentials.json
-        2. Environment variables: CREDENTIALS_JSON
-        3. Individual env vars: type, project_id, private_key, client_email
-        
-        For local development, use .streamlit/secrets.toml
+class HtmlTemplates:
+    """Pre-minified HTML fragments; cards are rendered once per distinct value"""
+    
+    HEADER = StyleManager.minify_html("""
+        <div class="main-header">
+            <div class="main-title">LuxQuant VIP | 智汇尊享会</div>
+            <div class="subtitle">Tools for Automated Crypto Trading Setup 24/7</div>
+            <div class="subtitle">Help traders identify market opportunities without having to monitor charts continuously.</div>
+            <div class="accuracy-badge">⚡ 24/7 Automated Signals ⚡</div>
+            <div class="accuracy-badge" style="margin-top: 0.5rem;">Historical Accuracy of 87.9% (No Future Guarantee)</div>
+        </div>
         """)
     
-    def get_sheet_data(self) -> Optional[pd.DataFrame]:
-        """Get all data from Google Sheets and convert to DataFrame"""
+    FOOTER = StyleManager.minify_html("""
+        <div class='footer-container' style='text-align: center; padding: clamp(1rem, 3vw, 2rem); background: linear-gradient(135deg, rgba(255, 255, 255, 0.1) 0%, rgba(255, 255, 255, 0.05) 100%); backdrop-filter: blur(10px); border-radius: 15px; margin-top: 2rem;'>
+            <h3 style='color: #F0B90B; margin-bottom: 1rem; font-size: clamp(1.2rem, 3vw, 1.5rem);'>Ready to Start Automated Trading?</h3>
+            <p style='color: #FFFFFF; margin-bottom: 1.5rem; font-size: clamp(0.9rem, 2vw, 1rem);'>Join thousands of traders using LuxQuant VIP for automated crypto trading signals.</p>
+            <p style='color: #C7C7C7; font-size: clamp(0.8rem, 1.5vw, 0.9rem);'>Made with ❤️ by LuxQuant VIP | 智汇尊享会 | Historical accuracy does not guarantee future results</p>
+        </div>
+        """)
+    
+    STAT_CARD = StyleManager.minify_html("""
+        <div class="stat-card">
+            <div class="stat-icon">{icon}</div>
+            <div class="stat-value">{value}</div>
+            <div class="stat-label">{label}</div>
+        </div>
+        """)
+    
+    INSIGHT_CARD = StyleManager.minify_html("""
+        <div class="stat-card">
+            <div class="stat-icon">{icon}</div>
+            <div class="stat-label" style="color: {color}; font-weight: 600;">{label}</div>
+            <div class="stat-detail">{detail}</div>
+        </div>
+        """)
+    
+    @staticmethod
+    @lru_cache(maxsize=Config.HTML_TEMPLATE_CACHE_SIZE)
+    def stat_card(icon: str, value: str, label: str) -> str:
+        """Key metric card"""
+        return HtmlTemplates.STAT_CARD.format(icon=icon, value=value, label=label)
+    
+    @staticmethod
+    @lru_cache(maxsize=Config.HTML_TEMPLATE_CACHE_SIZE)
+    def insight_card(icon: str, label: str, color: str, detail: str) -> str:
+        """Insight card with a colored headline and a detail line"""
+        return HtmlTemplates.INSIGHT_CARD.format(icon=icon, label=label, color=color, detail=detail)
+
+# ==================== METRICS ====================
+class Metrics:
+    """Process-wide latency histograms, counters and gauges for the hot path
+    
+    Stage timings share Prometheus-style cumulative buckets so the diagnostics
+    panel and a scraper see the same numbers.
+    """
+    
+    # Upper bounds of the latency buckets, in seconds
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    
+    def __init__(self, buckets: tuple = BUCKETS):
+        self.buckets = tuple(buckets)
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[str, Any]] = {}
+        self._counters: Dict[tuple, float] = {}
+        self._gauges: Dict[tuple, float] = {}
+    
+    @contextmanager
+    def timer(self, stage: str):
+        """Time the enclosed block into the stage's histogram, even if it raises"""
+        started = time.perf_counter()
         try:
-            sheet = self.connect_to_gsheet()
-            all_values = sheet.get_all_values()
-            
-            if not all_values or len(all_values) < 2:
-                return None
-            
-            header_row = all_values[0]
-            data_rows = all_values[1:]
-            
-            # Find last row with data
-            last_index = self._find_last_data_row(data_rows)
-            valid_data_rows = data_rows[:last_index + 1] if data_rows else []
-            
-            if not valid_data_rows:
-                return None
-            
-            df = pd.DataFrame(valid_data_rows, columns=header_row)
-            df = self._clean_dataframe(df)
-            
-            return df if not df.empty else None
-            
-        except Exception as e:
-            st.error(f"Error fetching data: {str(e)}")
-            return None
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
     
-    def _find_last_data_row(self, data_rows: list) -> int:
-        """Find the last row containing data"""
-        last_index = 0
-        for i, row in enumerate(data_rows):
-            if any(row[:6]):  # Check first 6 columns for data
-                last_index = i
-        return last_index
+    def observe(self, stage: str, seconds: float):
+        """Record one stage duration"""
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = {
+                    'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0, 'max': 0.0,
+                }
+            histogram['counts'][index] += 1
+            histogram['sum'] += seconds
+            histogram['count'] += 1
+            histogram['max'] = max(histogram['max'], seconds)
     
-    def _clean_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Clean and process the DataFrame"""
-        # Remove empty rows
-        df = df[df.iloc[:, :6].any(axis=1)]
-        df.columns = df.columns.str.strip()
-        
-        # Map columns
-        df = self._map_columns(df)
-        
-        # Process numeric columns
-        df = self._process_numeric_columns(df)
+    def increment(self, name: str, amount: float = 1, **labels):
+        """Add to a counter such as data_cache_requests{result="hit"}"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+    
+    def set_gauge(self, name: str, value: float, **labels):
+        """Set a point-in-time value such as the number of rows loaded"""
+        with self._lock:
+            self._gauges[(name, tuple(sorted(labels.items())))] = value
+    
+    def stage_summary(self) -> list:
+        """Per-stage count, mean, estimated p50/p95/p99 and max, slowest total first"""
+        with self._lock:
+            histograms = {stage: dict(h, counts=list(h['counts'])) for stage, h in self._histograms.items()}
         
-        # Process winrate
-        df = self._process_winrate(df)
+        rows = []
+        for stage, histogram in histograms.items():
+            rows.append({
+                'stage': stage,
+                'count': histogram['count'],
+                'total_s': histogram['sum'],
+                'mean_ms': 1000 * histogram['sum'] / histogram['count'],
+                'p50_ms': 1000 * self._quantile(histogram, 0.50),
+                'p95_ms': 1000 * self._quantile(histogram, 0.95),
+                'p99_ms': 1000 * self._quantile(histogram, 0.99),
+                'max_ms': 1000 * histogram['max'],
+            })
+        return sorted(rows, key=lambda row: row['total_s'], reverse=True)
+    
+    def values(self) -> Dict[str, Dict[str, float]]:
+        """Counters and gauges keyed by their Prometheus-style series name"""
+        with self._lock:
+            return {
+                'counters': {self._series(name, labels): value for (name, labels), value in self._counters.items()},
+                'gauges': {self._series(name, labels): value for (name, labels), value in self._gauges.items()},
+            }
+    
+    def to_prometheus(self, prefix: str = 'luxquant') -> str:
+        """Render everything in the Prometheus text exposition format"""
+        with self._lock:
+            histograms = {stage: dict(h, counts=list(h['counts'])) for stage, h in self._histograms.items()}
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
         
-        # Process dates
-        df = self._process_dates(df)
+        lines = [
+            f"# HELP {prefix}_stage_duration_seconds Time spent in each dashboard stage",
+            f"# TYPE {prefix}_stage_duration_seconds histogram",
+        ]
+        for stage in sorted(histograms):
+            histogram = histograms[stage]
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), histogram['counts']):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{prefix}_stage_duration_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_duration_seconds_sum{{stage="{stage}"}} {histogram["sum"]:.6f}')
+            lines.append(f'{prefix}_stage_duration_seconds_count{{stage="{stage}"}} {histogram["count"]}')
         
-        # Sort by date if available
-        if 'Date_parsed' in df.columns and not df['Date_parsed'].isna().all():
-            df['Date_parsed'] = pd.to_datetime(df['Date_parsed'], errors='coerce')
-            df = df.sort_values('Date_parsed')
+        for metric_type, series, suffix in (('counter', counters, '_total'), ('gauge', gauges, '')):
+            for name in sorted({name for name, _ in series}):
+                lines.append(f"# TYPE {prefix}_{name}{suffix} {metric_type}")
+                for (series_name, labels), value in sorted(series.items()):
+                    if series_name == name:
+                        lines.append(f"{self._series(f'{prefix}_{name}{suffix}', labels)} {value:g}")
         
-        return df
+        lines.append(f"# TYPE {prefix}_uptime_seconds gauge")
+        lines.append(f"{prefix}_uptime_seconds {time.time() - self.started_at:.0f}")
+        return "\n".join(lines) + "\n"
     
-    def _map_columns(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Map column names to standard format"""
-        column_mapping = {}
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if any(keyword in col_lower for keyword in ['date', 'tanggal', 'tgl']):
-                column_mapping['Date'] = col
-            elif any(keyword in col_lower for keyword in ['total', 'signal']):
-                column_mapping['Total_Signal'] = col
-            elif 'finish' in col_lower:
-                column_mapping['Finished'] = col
-            elif col_lower == 'tp':
-                column_mapping['TP'] = col
-            elif col_lower == 'sl':
-                column_mapping['SL'] = col
-            elif any(keyword in col_lower for keyword in ['winrate', 'win_rate', 'win rate']):
-                column_mapping['Winrate_pct'] = col
-        
-        return df.rename(columns=column_mapping)
+    def write_textfile(self, path: str):
+        """Atomically write the exposition for a node_exporter textfile collector"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
     
-    def _process_numeric_columns(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Process numeric columns"""
-        numeric_columns = ['Total_Signal', 'Finished', 'TP', 'SL']
-        for col in numeric_columns:
-            if col in df.columns:
-                df[col] = df[col].astype(str).str.replace(r'[^\d]', '', regex=True)
-                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
-        return df
+    def reset(self):
+        """Forget everything recorded so far"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+            self.started_at = time.time()
     
-    def _process_winrate(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Process winrate column"""
-        if 'Winrate_pct' in df.columns:
-            df['Winrate_num'] = df['Winrate_pct'].astype(str).str.replace('%', '').str.strip()
-            df['Winrate_num'] = pd.to_numeric(df['Winrate_num'], errors='coerce').fillna(0)
-        return df
+    def _quantile(self, histogram: Dict[str, Any], q: float) -> float:
+        """Estimate a quantile by interpolating inside its bucket, like histogram_quantile()"""
+        rank = q * histogram['count']
+        cumulative = 0
+        lower = 0.0
+        for bound, count in zip(self.buckets, histogram['counts']):
+            if count and cumulative + count >= rank:
+                return min(lower + (bound - lower) * (rank - cumulative) / count, histogram['max'])
+            cumulative += count
+            lower = bound
+        return histogram['max']
     
-    def _process_dates(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Process date column"""
-        if 'Date' not in df.columns:
-            return df
-        
-        df['Date_parsed'] = None
-        df['Date_display'] = df['Date'].astype(str)
-        
-        for idx, date_str in enumerate(df['Date']):
-            if pd.isna(date_str) or date_str == '' or str(date_str).strip() == '':
-                continue
-            
-            parsed_date = self._parse_date_string(str(date_str).strip(), idx, len(df))
-            if parsed_date:
-                df.at[idx, 'Date_parsed'] = parsed_date
-                df.at[idx, 'Date_display'] = parsed_date.strftime('%Y-%m-%d')
-        
-        return df
+    @staticmethod
+    def _series(name: str, labels: tuple) -> str:
+        """Series name with its labels, e.g. data_cache_requests{result="hit"}"""
+        if not labels:
+            return name
+        return name + '{' + ','.join(f'{key}="{value}"' for key, value in labels) + '}'
+
+@st.cache_resource
+def get_metrics() -> Metrics:
+    """Shared metrics registry for every session in this process"""
+    return Metrics()
+
+# ==================== SINGLE FLIGHT ====================
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one execution
     
-    def _parse_date_string(self, date_str: str, idx: int, total_rows: int) -> Optional[datetime.datetime]:
-        """Parse individual date string"""
-        # Handle date ranges
-        range_pattern = re.search(r'(\d{2})/(\d{2})-(\d{2})/(\d{2})', date_str)
-        if range_pattern:
-            start_month, start_day, end_month, end_day = range_pattern.groups()
-            try:
-                current_year = datetime.datetime.now().year
-                return pd.to_datetime(f"{current_year}-{end_month}-{end_day}", format='%Y-%m-%d')
-            except:
-                pass
-        
-        # Handle standard date formats
-        date_patterns = [
-            r'(\d{4})-(\d{1,2})-(\d{1,2})',
-            r'(\d{1,2})/(\d{1,2})/(\d{4})',
-            r'(\d{1,2})-(\d{1,2})-(\d{4})',
-        ]
+    The first caller runs the function; callers arriving while it runs wait
+    and share its result or exception. Nothing is kept afterwards, so the
+    next call with that key runs again.
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Any, Dict[str, Any]] = {}
+    
+    def do(self, key, fn: Callable[[], Any]) -> Any:
+        """Run fn for key, or wait for the identical call already in flight"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {'done': threading.Event(), 'finished': False, 'result': None, 'error': None}
         
-        for pattern in date_patterns:
-            match = re.search(pattern, date_str)
-            if match:
-                try:
-                    if pattern == date_patterns[0]:
-                        year, month, day = match.groups()
-                    else:
-                        month, day, year = match.groups()
-                    
-                    return pd.to_datetime(f"{year}-{month}-{day}", format='%Y-%m-%d')
-                except:
-                    continue
+        if not leader:
+            get_metrics().increment('single_flight_calls', flight=self.name, role='follower')
+            call['done'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            if call['finished']:
+                return call['result']
+            # The leader was interrupted (e.g. its session reran) - run it ourselves
+            return self.do(key, fn)
         
-        # Try pandas parsing
         try:
-            parsed_date = pd.to_datetime(date_str, errors='coerce')
-            if not pd.isna(parsed_date):
-                return parsed_date
-        except:
-            pass
-        
-        # Default fallback
-        base_date = datetime.datetime.now() - pd.Timedelta(days=total_rows-idx-1)
-        return base_date
+            get_metrics().increment('single_flight_calls', flight=self.name, role='leader')
+            call['result'] = fn()
+            call['finished'] = True
+            return call['result']
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call['done'].set()
 
-# ==================== ANALYTICS ENGINE ====================
-class AnalyticsEngine:
-    """Handles all analytics and data processing operations"""
+# ==================== SNAPSHOT STORE ====================
+class SnapshotStore:
+    """Persists the cleaned DataFrame as a local Feather file for cold starts and outages"""
     
-    @staticmethod
-    def filter_data_by_period(df: Optional[pd.DataFrame], period: str) -> Optional[pd.DataFrame]:
-        """Filter DataFrame by selected time period"""
-        if df is None or df.empty:
+    def __init__(self, path: str):
+        self.path = Path(path)
+    
+    def save(self, entry: Dict[str, Any]):
+        """Atomically write the entry's DataFrame with its content hash and timestamp"""
+        table = pa.Table.from_pandas(entry['df'], preserve_index=True)
+        metadata = dict(table.schema.metadata or {})
+        metadata[b'luxquant.content_hash'] = str(entry.get('content_hash') or '').encode('utf-8')
+        metadata[b'luxquant.updated_at'] = str(entry['updated_at']).encode('utf-8')
+        table = table.replace_schema_metadata(metadata)
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        # Uncompressed so the file can be memory-mapped without a decode pass
+        feather.write_feather(table, str(tmp_path), compression='uncompressed')
+        os.replace(tmp_path, self.path)
+    
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Memory-map the snapshot and rebuild a cache entry from it"""
+        if not self.path.exists():
             return None
         
-        today = datetime.datetime.now()
+        table = feather.read_table(str(self.path), memory_map=True)
+        metadata = table.schema.metadata or {}
+        return {
+            'df': table.to_pandas(),
+            'content_hash': metadata.get(b'luxquant.content_hash', b'').decode('utf-8') or None,
+            'updated_at': float(metadata.get(b'luxquant.updated_at', b'0')),
+            'source': 'snapshot',
+        }
+
+# ==================== DATA CACHE ====================
+class EmptyDataError(Exception):
+    """The source answered, but with no data rows"""
+
+class DataCache:
+    """Process-wide TTL cache for the cleaned trading DataFrame
+    
+    Each entry is a dict holding the cleaned ``df``, the ``content_hash`` of the
+    raw rows it was built from, loader-specific ``sync`` state, and the
+    ``source``/``updated_at`` of the data it serves.
+    """
+    
+    def __init__(self, ttl: int, stale_ttl: int, snapshot: Optional[SnapshotStore] = None,
+                 retry_backoff: float = 30.0, max_backoff: float = 900.0):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.snapshot = snapshot
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._entry: Dict[str, Any] = {}
+        self._fetched_at = 0.0
+        self._refreshing = False
+        self._last_error = None
+        self._failed_at: Optional[float] = None
+        self._failures = 0
+        self._last_failure: Optional[Exception] = None
+        # Sessions missing the cache and the refresher share one load
+        self._flight = SingleFlight('data_load')
+    
+    @staticmethod
+    def hash_rows(rows: list, hasher=None):
+        """Feed raw rows into a running SHA-1 so appended rows can extend an existing hash"""
+        hasher = hasher.copy() if hasher is not None else hashlib.sha1()
+        for row in rows:
+            hasher.update(json.dumps(row, separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+            hasher.update(b'\n')
+        return hasher
+    
+    def get(self, loader: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Optional[pd.DataFrame]:
+        """Return cached data, serving stale entries while revalidating in the background"""
+        with self._lock:
+            if self._entry.get('df') is not None:
+                age = time.monotonic() - self._fetched_at
+                if age < self.ttl:
+                    get_metrics().increment('data_cache_requests', result='hit')
+                    return self._entry['df']
+                if age < self.ttl + self.stale_ttl:
+                    get_metrics().increment('data_cache_requests', result='stale')
+                    if not self._refreshing and not self._backing_off():
+                        self._refreshing = True
+                        threading.Thread(target=self._revalidate, args=(loader,), daemon=True).start()
+                    return self._entry['df']
+                if self._backing_off():
+                    # Past the stale window, but the source just failed: keep serving what we have
+                    get_metrics().increment('data_cache_requests', result='stale')
+                    return self._entry['df']
         
-        if 'Date_parsed' not in df.columns or df['Date_parsed'].isna().all():
-            total_rows = len(df)
-            
-            if period == 'week':
-                rows_to_keep = min(7, total_rows)
-                return df.iloc[-rows_to_keep:]
-            elif period == 'month':
-                rows_to_keep = min(30, total_rows)
-                return df.iloc[-rows_to_keep:]
-            else:
-                return df
-        
-        if period == 'week':
-            start_date = today - datetime.timedelta(days=7)
-            filtered_df = df[df['Date_parsed'] >= start_date]
-            return filtered_df if not filtered_df.empty else df.tail(7)
-        elif period == 'month':
-            start_date = today - datetime.timedelta(days=30)
-            filtered_df = df[df['Date_parsed'] >= start_date]
-            return filtered_df if not filtered_df.empty else df.tail(30)
-        else:
-            return df
+        get_metrics().increment('data_cache_requests', result='miss')
+        try:
+            return self._flight.do('load', lambda: self._load(loader))
+        except Exception as e:
+            # Keep serving whatever we have (including a snapshot) when the live fetch fails
+            with self._lock:
+                self._record_failure(e)
+                if self._entry.get('df') is not None:
+                    print(f"❌ Live data fetch failed, serving cached data: {e}")
+                    return self._entry['df']
+            raise
+    
+    def seed_from_snapshot(self):
+        """Serve the local snapshot immediately; the first request revalidates it in the background"""
+        if self.snapshot is None:
+            return
+        try:
+            entry = self.snapshot.load()
+        except Exception as e:
+            print(f"❌ Error reading data snapshot: {e}")
+            return
+        if entry is None:
+            return
+        self._tag_version(entry)
+        with self._lock:
+            if self._entry.get('df') is None:
+                self._entry = entry
+                self._fetched_at = time.monotonic() - self.ttl
+    
+    def status(self) -> Dict[str, Any]:
+        """Describe where the served data came from and how fresh it is"""
+        with self._lock:
+            return {
+                'source': self._entry.get('source'),
+                'updated_at': self._entry.get('updated_at'),
+                'stale': time.monotonic() - self._fetched_at >= self.ttl,
+                'last_error': self._last_error,
+                'consecutive_failures': self._failures,
+            }
+    
+    def invalidate(self):
+        """Drop the cached entry so the next request fetches fresh data"""
+        with self._lock:
+            self._entry = {}
+            self._fetched_at = 0.0
     
     @staticmethod
-    def calculate_statistics(df: Optional[pd.DataFrame]) -> Optional[Dict[str, Any]]:
-        """Calculate trading statistics from DataFrame"""
-        if df is None or df.empty:
-            return None
+    def _tag_version(entry: Dict[str, Any]):
+        """Stamp the content hash on the frame so derived caches can key on it"""
+        if entry.get('df') is not None:
+            entry['df'].attrs['data_version'] = entry.get('content_hash')
+    
+    def _load(self, loader: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Optional[pd.DataFrame]:
+        """Run the loader against the current entry and store its result"""
+        with self._lock:
+            current = dict(self._entry)
         
-        # Check required columns
-        if 'TP' not in df.columns or 'SL' not in df.columns:
-            return None
+        entry = dict(loader(current))
+        if entry.get('df') is None:
+            # A blank or header-only read must not replace good data or the snapshot
+            raise EmptyDataError("Data source returned no data rows")
+        entry['source'] = 'live'
+        entry['updated_at'] = time.time()
+        self._tag_version(entry)
         
-        tp_data = pd.to_numeric(df['TP'], errors='coerce').fillna(0)
-        sl_data = pd.to_numeric(df['SL'], errors='coerce').fillna(0)
+        with self._lock:
+            self._entry = entry
+            self._fetched_at = time.monotonic()
+            self._last_error = None
+            self._failed_at = None
+            self._failures = 0
         
-        stats = {
-            'total_tp': int(tp_data.sum()),
-            'total_sl': int(sl_data.sum()),
-        }
+        if self.snapshot is not None and entry.get('content_hash') != current.get('content_hash'):
+            try:
+                self.snapshot.save(entry)
+            except Exception as e:
+                print(f"❌ Error writing data snapshot: {e}")
         
-        # Calculate winrate
-        if stats['total_tp'] + stats['total_sl'] > 0:
-            stats['overall_winrate'] = 100 * stats['total_tp'] / (stats['total_tp'] + stats['total_sl'])
-        else:
-            stats['overall_winrate'] = 0
+        return entry.get('df')
+    
+    def refresh(self, loader: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Optional[pd.DataFrame]:
+        """Reload the entry now, recording any failure for status()"""
+        with self._lock:
+            self._refreshing = True
+        try:
+            return self._flight.do('load', lambda: self._load(loader))
+        except Exception as e:
+            with self._lock:
+                self._record_failure(e)
+            raise
+        finally:
+            with self._lock:
+                self._refreshing = False
+    
+    def _record_failure(self, error: Exception):
+        """Count a failed load once, however many coalesced callers saw it (caller holds the lock)"""
+        self._last_error = str(error)
+        if error is not self._last_failure:
+            self._last_failure = error
+            self._failed_at = time.monotonic()
+            self._failures += 1
+    
+    def _backing_off(self) -> bool:
+        """True while the last failed refresh is too recent to retry (caller holds the lock)"""
+        if self._failed_at is None:
+            return False
+        delay = min(self.retry_backoff * (2 ** (self._failures - 1)), self.max_backoff)
+        return time.monotonic() - self._failed_at < delay
+    
+    def _revalidate(self, loader: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        """Background refresh; keeps serving the stale entry on failure"""
+        try:
+            self.refresh(loader)
+        except Exception as e:
+            print(f"❌ Background data refresh failed: {e}")
+
+@st.cache_resource
+def get_data_cache() -> DataCache:
+    """Shared data cache for every session in this process"""
+    snapshot = SnapshotStore(Config.SNAPSHOT_PATH) if Config.SNAPSHOT_PATH else None
+    cache = DataCache(Config.DATA_CACHE_TTL, Config.DATA_CACHE_STALE_TTL, snapshot,
+                      Config.DATA_CACHE_RETRY_BACKOFF, Config.REFRESH_MAX_BACKOFF)
+    cache.seed_from_snapshot()
+    return cache
+
+# ==================== SHEETS CLIENT ====================
+class SheetsAPIError(Exception):
+    """Sheets API request that still failed after every retry"""
+    
+    def __init__(self, status: Optional[int], message: str):
+        super().__init__(f"Sheets API error {status}: {message}" if status else message)
+        self.status = status
+
+class SheetsClient:
+    """Asyncio front end to the Sheets values API over one pooled HTTP session
+    
+    Requests run on a dedicated event loop thread, which hands the blocking
+    HTTP calls to a small executor sharing one keep-alive connection pool.
+    Identical requests already in flight are coalesced, so a burst of viewers
+    makes a single upstream call. 429/5xx responses and connection errors
+    retry with jittered exponential backoff (honouring Retry-After). Access
+    tokens come from the ClientManager, which also hears about every request
+    that finally fails. Coalesced callers share one result object and must
+    not mutate it.
+    """
+    
+    BASE_URL = "https://sheets.googleapis.com/v4/spreadsheets"
+    SCOPES = [
+        "https://www.googleapis.com/auth/spreadsheets",
+        "https://www.googleapis.com/auth/drive",
+    ]
+    RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+    
+    def __init__(self, auth: ClientManager, max_retries: int = 5, backoff_base: float = 0.5,
+                 backoff_max: float = 32.0, pool_size: int = 10, timeout: float = 30.0):
+        self.auth = auth
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='luxquant-sheets-http')
+        
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closed = False
+        # Callers inside run(); a closed client is released once this drops to zero
+        self._active = 0
+        # Loop-confined: only touched from coroutines running on self._loop
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+    
+    def open_by_key(self, spreadsheet_id: str) -> 'ClientSpreadsheet':
+        """Spreadsheet handle mirroring gspread's ``client.open_by_key``"""
+        return ClientSpreadsheet(self, spreadsheet_id)
+    
+    def get_values(self, spreadsheet_id: str, range_name: str, params: Optional[dict] = None) -> list:
+        """Rows of an A1 range, padded to a rectangle like gspread's get_values"""
+        path = f"values/{urllib.parse.quote(range_name, safe='')}"
+        query = tuple(sorted((params or {}).items()))
+        response = self.run(lambda client: client.fetch(spreadsheet_id, path, query))
+        rows = response.get('values', [])
+        width = max((len(row) for row in rows), default=0)
+        return [list(row) + [''] * (width - len(row)) for row in rows] or [[]]
+    
+    def batch_get(self, spreadsheet_id: str, ranges: list, params: Optional[dict] = None) -> Dict[str, Any]:
+        """Raw ``values:batchGet`` response for several ranges in one request"""
+        query = tuple(('ranges', range_name) for range_name in ranges) + tuple(sorted((params or {}).items()))
+        return self.run(lambda client: client.fetch(spreadsheet_id, "values:batchGet", query))
+    
+    def run(self, request: Callable[['SheetsClient'], Any], retry: bool = True) -> Any:
+        """Run ``request(client)``'s coroutine on the client's event loop and wait for its result
+        
+        Callers may still hold a client that a reconnect has retired; their
+        request moves to the manager's replacement client once.
+        """
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._active += 1
+                loop = self._event_loop()
+        if closed:
+            if not retry:
+                raise RuntimeError("Sheets client was closed after a failure")
+            get_metrics().increment('sheets_requests', result='rerouted')
+            return self.auth.sheets_client().run(request, retry=False)
+        
+        try:
+            return asyncio.run_coroutine_threadsafe(request(self), loop).result()
+        finally:
+            with self._lock:
+                self._active -= 1
+                drained = self._closed and self._active == 0
+            if drained:
+                self._release()
+    
+    def close(self):
+        """Stop taking requests; the pool is released once the callers inside run() finish"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            drained = self._active == 0
+        if drained:
+            self._release()
+    
+    async def fetch(self, spreadsheet_id: str, path: str, query: tuple) -> Dict[str, Any]:
+        """GET a values endpoint, sharing the upstream call with identical requests in flight"""
+        key = (spreadsheet_id, path, query)
+        task = self._inflight.get(key)
+        get_metrics().increment('sheets_requests', result='coalesced' if task is not None else 'upstream')
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_with_retry(f"{self.BASE_URL}/{spreadsheet_id}/{path}", query))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        # One caller giving up must not cancel the request for everyone else
+        return await asyncio.shield(task)
+    
+    def _finish(self, key: tuple, task: asyncio.Future):
+        """Forget a settled request, reporting its failure once for all coalesced callers"""
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            self.auth.report_failure(task.exception())
+    
+    def _release(self):
+        """Free the pool and stop the loop once no caller is left (runs exactly once)"""
+        with self._lock:
+            loop = self._loop
+        if loop is None:
+            self._executor.shutdown(wait=False)
+            self.session.close()
+        else:
+            asyncio.run_coroutine_threadsafe(self._drain(), loop)
+    
+    async def _drain(self):
+        """Wait out the requests in flight, then release the pool and stop (and so close) the loop"""
+        await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+        self._executor.shutdown(wait=False)
+        self.session.close()
+        asyncio.get_running_loop().stop()
+    
+    async def _fetch_with_retry(self, url: str, query: tuple) -> Dict[str, Any]:
+        """Send the request, backing off on throttling, server errors and dropped connections"""
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            retry_after = None
+            try:
+                with get_metrics().timer('sheets_request'):
+                    response = await loop.run_in_executor(self._executor, self._get, url, query)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = SheetsAPIError(None, f"{type(e).__name__}: {e}")
+            else:
+                if response.ok:
+                    return response.json()
+                error = SheetsAPIError(response.status_code, response.text[:500])
+                if response.status_code == 401:
+                    # Token revoked or clock skew: force a refresh before the retry. Invalidating
+                    # takes the manager's locks, so keep it off the loop shared by every fetch
+                    await loop.run_in_executor(self._executor, self.auth.invalidate_token)
+                elif response.status_code not in self.RETRY_STATUSES:
+                    raise error
+                retry_after = response.headers.get('Retry-After')
+            
+            get_metrics().increment('sheets_retries', status=str(error.status or 'connection'))
+            if attempt >= self.max_retries:
+                raise error
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+            attempt += 1
+    
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        """Full-jitter exponential delay, or the server's Retry-After when it sends one"""
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_base * (2 ** attempt), self.backoff_max))
+    
+    def _get(self, url: str, query: tuple) -> requests.Response:
+        """Blocking GET on the pooled session (runs on the executor)"""
+        headers = {'Authorization': f"Bearer {self.auth.access_token()}"}
+        return self.session.get(url, params=list(query), headers=headers, timeout=self.timeout)
+    
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the client's event loop thread on first use (caller holds the lock)"""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(target=self._run_loop, args=(self._loop,), name="luxquant-sheets-client",
+                             daemon=True).start()
+        return self._loop
+    
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop):
+        """Event loop thread body; the loop is closed once _drain stops it"""
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+class ClientSpreadsheet:
+    """Spreadsheet handle of a SheetsClient, mirroring the gspread calls the app makes"""
+    
+    def __init__(self, client: SheetsClient, spreadsheet_id: str):
+        self.client = client
+        self.id = spreadsheet_id
+    
+    def worksheet(self, title: str) -> 'ClientWorksheet':
+        return ClientWorksheet(self, title)
+    
+    def values_batch_get(self, ranges: list, params: Optional[dict] = None) -> Dict[str, Any]:
+        return self.client.batch_get(self.id, ranges, params)
+
+class ClientWorksheet:
+    """Worksheet handle of a SheetsClient, mirroring the gspread calls the app makes"""
+    
+    def __init__(self, spreadsheet: ClientSpreadsheet, title: str):
+        self.spreadsheet = spreadsheet
+        self.title = title
+    
+    def get_all_values(self) -> list:
+        return self.get_values()
+    
+    def get_values(self, range_name: Optional[str] = None) -> list:
+        quoted = "'" + self.title.replace("'", "''") + "'"
+        return self.spreadsheet.client.get_values(
+            self.spreadsheet.id, f"{quoted}!{range_name}" if range_name else quoted)
+    
+    def row_values(self, row: int) -> list:
+        values = self.get_values(f"{row}:{row}")
+        return values[0] if values else []
+
+# ==================== CLIENT MANAGER ====================
+class ClientManager:
+    """Owns the process's Google credentials and the Sheets clients built on them
+    
+    Credentials are resolved and parsed once. A background thread refreshes the
+    access token ``refresh_margin`` seconds before it expires, so requests only
+    refresh inline if that thread has fallen behind. After an auth or transport
+    failure the clients are dropped; the next caller health-checks by minting a
+    fresh token (re-reading the credentials after auth failures) and reconnects.
+    """
+    
+    def __init__(self, credentials_loader: Callable[[], Dict[str, Any]], refresh_margin: int = 300,
+                 retry_base: float = 5.0, retry_max: float = 300.0):
+        self.credentials_loader = credentials_loader
+        self.refresh_margin = datetime.timedelta(seconds=refresh_margin)
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self._lock = threading.RLock()
+        self._token_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._auth_session = requests.Session()
+        self._credentials: Optional[Credentials] = None
+        self._sheets_client: Optional[SheetsClient] = None
+        self._gspread_client = None
+        self._worksheets: Dict[str, Any] = {}
+        # 'auth' or 'transport' once a failure was reported, until the next reconnect
+        self._reconnect: Optional[str] = None
+        self._last_failure: Optional[Exception] = None
+        self._health: Dict[str, Any] = {
+            'credentials_loaded_at': None,
+            'token_refreshed_at': None,
+            'token_expiry': None,
+            'connected_at': None,
+            'reconnects': 0,
+            'last_error': None,
+            'last_error_at': None,
+        }
+    
+    def credentials(self) -> Credentials:
+        """Parsed service account credentials, resolved once per process"""
+        with self._lock:
+            if self._credentials is None:
+                from google.oauth2.service_account import Credentials
+                
+                with get_metrics().timer('credentials_load'):
+                    self._credentials = Credentials.from_service_account_info(
+                        self.credentials_loader(), scopes=SheetsClient.SCOPES)
+                self._health['credentials_loaded_at'] = time.time()
+            credentials = self._credentials
+        self.start()
+        return credentials
+    
+    def access_token(self, force: bool = False) -> str:
+        """Valid access token, refreshed inline only when it is missing or expired"""
+        credentials = self.credentials()
+        with self._token_lock:
+            if force or not credentials.valid:
+                self._refresh_token(credentials)
+            return credentials.token
+    
+    def invalidate_token(self):
+        """Drop a token the API rejected so the next request mints a new one"""
+        credentials = self.credentials()
+        with self._token_lock:
+            credentials.token = None
+    
+    def sheets_client(self) -> SheetsClient:
+        """Shared pooled async client, rebuilt after a reported failure"""
+        self._reconnect_if_needed()
+        with self._lock:
+            if self._sheets_client is None:
+                with get_metrics().timer('client_connect'):
+                    self._sheets_client = SheetsClient(
+                        self,
+                        max_retries=Config.SHEETS_MAX_RETRIES,
+                        backoff_base=Config.SHEETS_BACKOFF_BASE,
+                        backoff_max=Config.SHEETS_BACKOFF_MAX,
+                        pool_size=Config.SHEETS_POOL_SIZE,
+                        timeout=Config.SHEETS_TIMEOUT,
+                    )
+                self._health['connected_at'] = time.time()
+            return self._sheets_client
+    
+    def worksheet(self, sheet_name: str):
+        """gspread worksheet, opened once per name on a shared gspread client"""
+        self._reconnect_if_needed()
+        with self._lock:
+            if sheet_name not in self._worksheets:
+                import gspread
+                
+                with get_metrics().timer('client_connect'):
+                    if self._gspread_client is None:
+                        self._gspread_client = gspread.authorize(self.credentials())
+                    self._worksheets[sheet_name] = self._gspread_client.open_by_key(
+                        Config.SPREADSHEET_ID).worksheet(sheet_name)
+                self._health['connected_at'] = time.time()
+            return self._worksheets[sheet_name]
+    
+    def report_failure(self, error: Exception):
+        """Schedule a reconnect when a request failed on auth or transport"""
+        kind = self._failure_kind(error)
+        with self._lock:
+            if kind is None or error is self._last_failure:
+                return
+            self._last_failure = error
+            # An auth failure also re-reads the credentials, so it wins over transport
+            if self._reconnect != 'auth':
+                self._reconnect = kind
+            self._health['last_error'] = str(error)
+            self._health['last_error_at'] = time.time()
+        get_metrics().increment('client_failures', kind=kind)
+    
+    def start(self):
+        """Start the token refresh thread if it is not already running"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="luxquant-token-refresher", daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        """Ask the token refresh thread to exit"""
+        self._stop.set()
+    
+    def health(self) -> Dict[str, Any]:
+        """Credential, token and connection state for monitoring"""
+        with self._lock:
+            health = dict(self._health)
+            health['pending_reconnect'] = self._reconnect
+            health['refresher_running'] = self._thread is not None and self._thread.is_alive()
+        return health
+    
+    def _reconnect_if_needed(self):
+        """Drop the clients after a reported failure and health-check before reconnecting"""
+        with self._lock:
+            kind, self._reconnect = self._reconnect, None
+            if kind is None:
+                return
+            client, self._sheets_client = self._sheets_client, None
+            self._gspread_client = None
+            self._worksheets.clear()
+            if kind == 'auth':
+                self._credentials = None
+            self._health['reconnects'] += 1
+        
+        get_metrics().increment('client_reconnects', kind=kind)
+        if client is not None:
+            client.close()
+        try:
+            with get_metrics().timer('client_health_check'):
+                self.access_token(force=True)
+        except Exception:
+            with self._lock:
+                self._reconnect = self._reconnect or kind
+            raise
+    
+    def _refresh_token(self, credentials: Credentials):
+        """Mint a new access token (caller holds the token lock)"""
+        from google.auth.transport.requests import Request as AuthRequest
+        
+        with get_metrics().timer('sheets_token_refresh'):
+            credentials.refresh(AuthRequest(self._auth_session))
+        with self._lock:
+            self._health['token_refreshed_at'] = time.time()
+            self._health['token_expiry'] = credentials.expiry.isoformat() if credentials.expiry else None
+    
+    def _expires_soon(self, credentials: Credentials) -> bool:
+        """True when the token is missing or inside the refresh margin"""
+        if not credentials.token or credentials.expiry is None:
+            return True
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        return credentials.expiry - now < self.refresh_margin
+    
+    def _next_delay(self, failures: int) -> float:
+        """Seconds until the token enters the refresh margin, backing off after failures"""
+        if failures:
+            return min(self.retry_base * (2 ** (failures - 1)), self.retry_max)
+        with self._lock:
+            credentials = self._credentials
+        if credentials is None or credentials.expiry is None:
+            return 0.0
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        return max((credentials.expiry - self.refresh_margin - now).total_seconds(), 1.0)
+    
+    def _run(self):
+        """Refresh the token ahead of expiry until stopped"""
+        failures = 0
+        while not self._stop.wait(self._next_delay(failures)):
+            try:
+                credentials = self.credentials()
+                with self._token_lock:
+                    if self._expires_soon(credentials):
+                        self._refresh_token(credentials)
+                failures = 0
+            except Exception as e:
+                failures += 1
+                with self._lock:
+                    self._health['last_error'] = str(e)
+                    self._health['last_error_at'] = time.time()
+                print(f"❌ Background token refresh failed: {e}")
+    
+    @staticmethod
+    def _failure_kind(error: Exception) -> Optional[str]:
+        """'auth' or 'transport' for failures a reconnect can fix, else None"""
+        from google.auth.exceptions import RefreshError, TransportError
+        
+        status = getattr(error, 'status', None)
+        if status is None:
+            status = getattr(getattr(error, 'response', None), 'status_code', None)
+        if isinstance(error, RefreshError) or status == 401:
+            return 'auth'
+        if isinstance(error, (TransportError, requests.ConnectionError, requests.Timeout)):
+            return 'transport'
+        if isinstance(error, SheetsAPIError) and error.status is None:
+            return 'transport'
+        return None
+
+@st.cache_resource
+def get_client_manager() -> ClientManager:
+    """Process-wide credential and client lifecycle manager"""
+    return ClientManager(DataManager()._get_credentials, Config.SHEETS_TOKEN_REFRESH_MARGIN)
+
+# ==================== DATA SOURCES ====================
+class DataSource(abc.ABC):
+    """Worksheet-shaped data source read by DataManager
+    
+    Backends return rows as lists of cell strings, header row first, exactly
+    like gspread's ``get_all_values()`` and ``get_values(range_name)``.
+    ``read`` lets a backend push column and date filters down to the store;
+    backends that cannot filter return everything and DataManager trims the
+    cleaned frame instead.
+    """
+    
+    # Positional range reads are cheap, so DataManager may sync appended rows only
+    supports_incremental = False
+    
+    # Requested column sets already reported as missing, so each is logged once per process
+    _reported_missing: set = set()
+    
+    @abc.abstractmethod
+    def get_all_values(self) -> list:
+        """Return every row of the worksheet"""
+    
+    def get_values(self, range_name: str) -> list:
+        """Return the rows of an A1 range such as ``A120:F``"""
+        return self._slice_range(self.get_all_values(), range_name)
+    
+    def get_rows_from(self, start_row: int, width: int) -> list:
+        """Return rows from 1-based sheet row start_row onward, shaped like read()'s data rows"""
+        return self.get_values(f"A{start_row}:{self._column_letter(width)}")
+    
+    def read(self, columns: Optional[list] = None, start_date: Optional[datetime.date] = None,
+             end_date: Optional[datetime.date] = None) -> list:
+        """Return the header and rows restricted to columns and an inclusive date range where supported"""
+        return self.get_all_values()
+    
+    def change_token(self) -> Optional[tuple]:
+        """Cheap token that changes whenever the data may have changed, or None if unknown"""
+        return None
+    
+    @staticmethod
+    def _slice_range(values: list, range_name: str) -> list:
+        """Cut an A1 range out of in-memory rows"""
+        from gspread.utils import a1_range_to_grid_range
+        
+        grid = a1_range_to_grid_range(range_name)
+        col_start = grid.get('startColumnIndex', 0)
+        col_end = grid.get('endColumnIndex')
+        rows = values[grid.get('startRowIndex', 0):grid.get('endRowIndex')]
+        return [list(row[col_start:col_end]) for row in rows] or [[]]
+    
+    @staticmethod
+    def _column_letter(column: int) -> str:
+        """A1 letter of a 1-based column number, e.g. 28 -> AB"""
+        letters = ''
+        while column > 0:
+            column, remainder = divmod(column - 1, 26)
+            letters = chr(ord('A') + remainder) + letters
+        return letters
+    
+    @staticmethod
+    def _select_columns(available: list, columns: Optional[list]) -> list:
+        """Source columns that map to a requested column; missing ones are logged once
+        
+        Headers are matched through DataManager.standard_column, so 'Winrate' or
+        'Total Signal' are read for Winrate_pct / Total_Signal. Only when none of
+        the requested columns exist is every column read.
+        """
+        if columns is None:
+            return list(available)
+        selected, covered = [], set()
+        for name in available:
+            standard = name if name in columns else DataManager.standard_column(str(name))
+            if standard in columns:
+                selected.append(name)
+                covered.add(standard)
+        missing = tuple(column for column in columns if column not in covered)
+        if missing and missing not in DataSource._reported_missing:
+            DataSource._reported_missing.add(missing)
+            print(f"⚠️ Source has no column for {', '.join(missing)}; reading the rest")
+        return selected or list(available)
+    
+    @staticmethod
+    def _to_cell(value) -> str:
+        """Render a typed value the way it would appear in a sheet cell"""
+        if value is None:
+            return ''
+        if isinstance(value, float):
+            if value != value:
+                return ''
+            return str(int(value)) if value.is_integer() else str(value)
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            return value.isoformat()
+        return str(value)
+    
+    @staticmethod
+    def _file_token(*paths: str) -> Optional[tuple]:
+        """Modification time and size of the files backing a source"""
+        token = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                token.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                token.append(None)
+        return tuple(token)
+
+class SheetsDataSource(DataSource):
+    """Google Sheets worksheet behind the shared gspread connection
+    
+    With ``project_columns`` the header is detected once and reads fetch only
+    the columns the dashboard maps, in one ``values:batchGet`` call with
+    UNFORMATTED_VALUE rendering, so counts arrive as numbers and blank count
+    cells as None. Dates keep their displayed text. Percent-formatted winrate
+    cells arrive as fractions (0.875) and are scaled back to percentages; the
+    format is read from the displayed winrate cells when the header is detected.
+    """
+    
+    supports_incremental = True
+    
+    BATCH_GET_PARAMS = {
+        'majorDimension': 'COLUMNS',
+        'valueRenderOption': 'UNFORMATTED_VALUE',
+        'dateTimeRenderOption': 'FORMATTED_STRING',
+    }
+    NUMERIC_COLUMNS = ('Total_Signal', 'Finished', 'TP', 'SL')
+    # Displayed winrate cells sampled to tell a percent format from plain numbers
+    FORMAT_SAMPLE_ROWS = 20
+    
+    def __init__(self, sheet_name: Optional[str] = None, project_columns: bool = False):
+        self.sheet_name = sheet_name
+        self.project_columns = project_columns
+        self._lock = threading.Lock()
+        # (1-based column, header, dashboard column) for each projected column, and
+        # whether the winrate column is percent-formatted; both guarded by _lock
+        self._columns: Optional[list] = None
+        self._winrate_fractions = False
+    
+    def get_all_values(self) -> list:
+        with self._reporting_failures():
+            return self._worksheet().get_all_values()
+    
+    def get_values(self, range_name: str) -> list:
+        with self._reporting_failures():
+            return self._worksheet().get_values(range_name)
+    
+    def read(self, columns: Optional[list] = None, start_date: Optional[datetime.date] = None,
+             end_date: Optional[datetime.date] = None) -> list:
+        if not self.project_columns or columns is None:
+            return self.get_all_values()
+        
+        # Every column range starts at the header, so a moved column is caught and re-detected
+        with self._reporting_failures():
+            for _ in range(2):
+                projected = self._projected_columns(columns)
+                if not projected:
+                    break
+                values = self._batch_get(projected, start_row=1)
+                if values and values[0] == [header for _, header, _ in projected]:
+                    return values
+                with self._lock:
+                    self._columns = None
+        return self.get_all_values()
+    
+    def get_rows_from(self, start_row: int, width: int) -> list:
+        with self._lock:
+            projected = self._columns
+        if not self.project_columns or projected is None or len(projected) != width:
+            return super().get_rows_from(start_row, width)
+        with self._reporting_failures():
+            return self._batch_get(projected, start_row)
+    
+    def _worksheet(self):
+        """Worksheet on the pooled async client, or gspread's when SHEETS_CLIENT is 'gspread'"""
+        if Config.SHEETS_CLIENT == 'gspread':
+            return DataManager().connect_to_gsheet(self.sheet_name)
+        client = get_client_manager().sheets_client()
+        return client.open_by_key(Config.SPREADSHEET_ID).worksheet(self.sheet_name or Config.SHEET_NAME)
+    
+    @staticmethod
+    @contextmanager
+    def _reporting_failures():
+        """Let the client manager reconnect after auth or transport failures"""
+        try:
+            yield
+        except Exception as e:
+            get_client_manager().report_failure(e)
+            raise
+    
+    def _projected_columns(self, columns: list) -> list:
+        """Header cells the dashboard maps into ``columns``, detected on first use"""
+        with self._lock:
+            if self._columns is not None:
+                return self._columns
+        
+        header = self._worksheet().row_values(1)
+        projected = []
+        for index, name in enumerate(header, start=1):
+            standard = DataManager.standard_column(name)
+            if standard in columns:
+                projected.append((index, name, standard))
+        fractions = any(standard == 'Winrate_pct' and self._percent_formatted(index)
+                        for index, _, standard in projected)
+        
+        with self._lock:
+            self._columns = projected
+            self._winrate_fractions = fractions
+        return projected
+    
+    def _percent_formatted(self, index: int) -> bool:
+        """True when the first filled data cell of a column is displayed as a percentage"""
+        letter = self._column_letter(index)
+        # get_values renders FORMATTED_VALUE, so a percent format shows as '87.5%'
+        rows = self._worksheet().get_values(f"{letter}2:{letter}{self.FORMAT_SAMPLE_ROWS + 1}")
+        for row in rows:
+            if row and str(row[0]).strip():
+                return str(row[0]).strip().endswith('%')
+        return False
+    
+    def _batch_get(self, projected: list, start_row: int) -> list:
+        """Fetch the projected columns from start_row down in a single batchGet, as rows"""
+        worksheet = self._worksheet()
+        with self._lock:
+            fractions = self._winrate_fractions
+        title = worksheet.title.replace("'", "''")
+        ranges = [f"'{title}'!{self._column_letter(index)}{start_row}:{self._column_letter(index)}"
+                  for index, _, _ in projected]
+        response = worksheet.spreadsheet.values_batch_get(ranges, params=self.BATCH_GET_PARAMS)
+        
+        cells, blanks = [], []
+        for (_, _, standard), value_range in zip(projected, response.get('valueRanges', [])):
+            blank = None if standard in self.NUMERIC_COLUMNS else ''
+            column = [blank if value == '' else value for value in (value_range.get('values') or [[]])[0]]
+            if standard == 'Winrate_pct' and fractions:
+                column = self._scale_winrate(column, has_header=start_row == 1)
+            cells.append(column)
+            blanks.append(blank)
+        
+        # The API drops trailing blanks per column; pad every column to the longest one
+        height = max((len(column) for column in cells), default=0)
+        rows = [[column[i] if i < len(column) else blank for column, blank in zip(cells, blanks)]
+                for i in range(height)]
+        return rows or [[]]
+    
+    @staticmethod
+    def _scale_winrate(column: list, has_header: bool) -> list:
+        """Scale percent-formatted fractions (0.875) to 87.5, leaving the header and text cells"""
+        start = 1 if has_header else 0
+        return column[:start] + [value * 100 if isinstance(value, (int, float)) else value
+                                 for value in column[start:]]
+
+class CSVDataSource(DataSource):
+    """CSV export with a header row, streamed so filtered-out rows are never kept
+    
+    Dates are compared as ISO-8601 strings; rows whose date is not ISO are kept
+    and left to DataManager's final filter.
+    """
+    
+    ISO_DATE = re.compile(r'\d{4}-\d{2}-\d{2}')
+    
+    def __init__(self, path: str, date_column: str = 'Date'):
+        self.path = path
+        self.date_column = date_column
+    
+    def get_all_values(self) -> list:
+        return self.read()
+    
+    def read(self, columns: Optional[list] = None, start_date: Optional[datetime.date] = None,
+             end_date: Optional[datetime.date] = None) -> list:
+        start = start_date.isoformat() if start_date else None
+        end = end_date.isoformat() if end_date else None
+        
+        with open(self.path, 'r', newline='') as f:
+            reader = csv.reader(f)
+            header = [cell.strip() for cell in next(reader, [])]
+            keep = [header.index(name) for name in self._select_columns(header, columns)]
+            date_index = header.index(self.date_column) if self.date_column in header else None
+            filter_dates = date_index is not None and (start or end)
+            
+            rows = [[header[i] for i in keep]]
+            for row in reader:
+                if filter_dates and date_index < len(row):
+                    day = row[date_index].strip()[:10]
+                    if self.ISO_DATE.fullmatch(day) and ((start and day < start) or (end and day > end)):
+                        continue
+                rows.append([row[i] if i < len(row) else '' for i in keep])
+        return rows
+    
+    def change_token(self) -> Optional[tuple]:
+        return self._file_token(self.path)
+
+class SQLiteDataSource(DataSource):
+    """Table in a SQLite database, filtered by SQL before any row reaches Python
+    
+    The date column is expected to hold ISO-8601 text, which sorts chronologically.
+    """
+    
+    def __init__(self, path: str, table: str, date_column: str = 'Date'):
+        self.path = path
+        self.table = table
+        self.date_column = date_column
+    
+    def get_all_values(self) -> list:
+        return self.read()
+    
+    def read(self, columns: Optional[list] = None, start_date: Optional[datetime.date] = None,
+             end_date: Optional[datetime.date] = None) -> list:
+        import sqlite3
+        
+        quote = lambda name: '"' + name.replace('"', '""') + '"'
+        # The connection's own context manager only ends the transaction; closing() releases it
+        with closing(sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)) as conn:
+            available = [row[1] for row in conn.execute(f"PRAGMA table_info({quote(self.table)})")]
+            if not available:
+                raise ValueError(f"SQLite table '{self.table}' not found in {self.path}")
+            selected = self._select_columns(available, columns)
+            
+            clauses, params = [], []
+            if self.date_column in available:
+                if start_date:
+                    clauses.append(f"{quote(self.date_column)} >= ?")
+                    params.append(start_date.isoformat())
+                if end_date:
+                    # Timestamps such as '2024-05-01 13:00' still fall on the end day
+                    clauses.append(f"substr({quote(self.date_column)}, 1, 10) <= ?")
+                    params.append(end_date.isoformat())
+            
+            query = f"SELECT {', '.join(map(quote, selected))} FROM {quote(self.table)}"
+            if clauses:
+                query += " WHERE " + " AND ".join(clauses)
+            query += " ORDER BY rowid"
+            
+            rows = [selected]
+            rows.extend([self._to_cell(value) for value in row] for row in conn.execute(query, params))
+        return rows
+    
+    def change_token(self) -> Optional[tuple]:
+        # Writers in WAL mode only touch the -wal file until a checkpoint
+        return self._file_token(self.path, self.path + '-wal')
+
+class ParquetDataSource(DataSource):
+    """Parquet file read through pyarrow with column projection and row-group pruning"""
+    
+    def __init__(self, path: str, date_column: str = 'Date'):
+        self.path = path
+        self.date_column = date_column
+    
+    def get_all_values(self) -> list:
+        return self.read()
+    
+    def read(self, columns: Optional[list] = None, start_date: Optional[datetime.date] = None,
+             end_date: Optional[datetime.date] = None) -> list:
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+        
+        schema = pq.read_schema(self.path)
+        selected = self._select_columns(schema.names, columns)
+        
+        filters = []
+        if self.date_column in schema.names:
+            date_type = schema.field(self.date_column).type
+            if start_date:
+                filters.append((self.date_column, '>=', self._date_bound(start_date, date_type)))
+            if end_date:
+                end = end_date + datetime.timedelta(days=1)
+                filters.append((self.date_column, '<', self._date_bound(end, date_type)))
+        
+        table = pq.read_table(self.path, columns=selected, filters=filters or None)
+        
+        cells = []
+        for name in selected:
+            column = table.column(name)
+            if not pa.types.is_string(column.type):
+                # Arrow renders 12.0 as "12", which the numeric cleaner expects
+                column = pc.cast(column, pa.string())
+            cells.append(['' if value is None else value for value in column.to_pylist()])
+        
+        return [selected] + [list(row) for row in zip(*cells)]
+    
+    def change_token(self) -> Optional[tuple]:
+        return self._file_token(self.path)
+    
+    @staticmethod
+    def _date_bound(day: datetime.date, date_type: pa.DataType):
+        """Filter value matching the stored type of the date column"""
+        if pa.types.is_timestamp(date_type):
+            return pd.Timestamp(day).tz_localize(date_type.tz) if date_type.tz else pd.Timestamp(day)
+        if pa.types.is_date(date_type):
+            return day
+        # ISO strings; '<' the next day keeps same-day timestamps
+        return day.isoformat()
+
+class SimulatedQuotaError(Exception):
+    """Raised by FakeSheetSource to mimic a Sheets API 429"""
+
+class FakeSheetSource(DataSource):
+    """In-process stand-in worksheet for offline load testing
+    
+    Simulates per-read latency, random quota errors and an append-only sheet
+    that grows by ``growth_rows`` rows on every read.
+    """
+    
+    supports_incremental = True
+    
+    def __init__(self, values: list, latency: float = 0.0, latency_jitter: float = 0.0,
+                 error_rate: float = 0.0, growth_rows: int = 0, seed: Optional[int] = None):
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.growth_rows = growth_rows
+        self._values = [list(row) for row in values]
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.reads = 0
+    
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> 'FakeSheetSource':
+        """Load rows from a CSV file or a JSON list of rows"""
+        if path.lower().endswith('.json'):
+            with open(path, 'r') as f:
+                values = json.load(f)
+        else:
+            with open(path, 'r', newline='') as f:
+                values = list(csv.reader(f))
+        return cls([[str(cell) for cell in row] for row in values], **kwargs)
+    
+    def get_all_values(self) -> list:
+        self._simulate_read()
+        with self._lock:
+            return [list(row) for row in self._values]
+    
+    def get_values(self, range_name: str) -> list:
+        self._simulate_read()
+        with self._lock:
+            return self._slice_range(self._values, range_name)
+    
+    def _simulate_read(self):
+        """Apply latency, maybe fail with a quota error, then grow the sheet"""
+        with self._lock:
+            self.reads += 1
+            delay = max(self.latency + self._random.uniform(-self.latency_jitter, self.latency_jitter), 0)
+            fail = self._random.random() < self.error_rate
+        
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise SimulatedQuotaError("APIError: [429]: Quota exceeded for quota metric 'Read requests' (simulated)")
+        if self.growth_rows:
+            self._append_rows(self.growth_rows)
+    
+    def _append_rows(self, count: int):
+        """Append copies of existing rows dated one day after the last ISO-dated row"""
+        with self._lock:
+            data_rows = [row for row in self._values[1:] if any(row)]
+            if not data_rows:
+                return
+            last_date = None
+            for row in reversed(data_rows):
+                try:
+                    last_date = datetime.date.fromisoformat(row[0])
+                    break
+                except (ValueError, IndexError):
+                    continue
+            
+            for i in range(count):
+                row = list(self._random.choice(data_rows))
+                if last_date is not None:
+                    row[0] = (last_date + datetime.timedelta(days=i + 1)).isoformat()
+                self._values.append(row)
+
+@st.cache_resource
+def get_data_source(target: Optional[str] = None) -> DataSource:
+    """Process-wide data source selected by Config.DATA_SOURCE
+    
+    ``target`` picks one strategy's worksheet (table for sqlite, file path for
+    csv/parquet/fake) in place of the configured default.
+    """
+    if Config.DATA_SOURCE == 'fake':
+        return FakeSheetSource.from_file(
+            target or Config.FAKE_SHEET_PATH,
+            latency=Config.FAKE_SHEET_LATENCY,
+            latency_jitter=Config.FAKE_SHEET_LATENCY_JITTER,
+            error_rate=Config.FAKE_SHEET_ERROR_RATE,
+            growth_rows=Config.FAKE_SHEET_GROWTH_ROWS,
+        )
+    if Config.DATA_SOURCE == 'csv':
+        return CSVDataSource(target or Config.DATA_SOURCE_PATH, Config.DATA_DATE_COLUMN)
+    if Config.DATA_SOURCE == 'sqlite':
+        return SQLiteDataSource(Config.DATA_SOURCE_PATH, target or Config.DATA_SOURCE_TABLE, Config.DATA_DATE_COLUMN)
+    if Config.DATA_SOURCE == 'parquet':
+        return ParquetDataSource(target or Config.DATA_SOURCE_PATH, Config.DATA_DATE_COLUMN)
+    if Config.DATA_SOURCE != 'sheets':
+        raise ValueError(f"Unknown DATA_SOURCE '{Config.DATA_SOURCE}' (expected sheets, csv, sqlite, parquet or fake)")
+    return SheetsDataSource(target, Config.SHEETS_COLUMN_PROJECTION)
+
+# ==================== DATA MANAGER ====================
+class DataManager:
+    """Handles all data operations including Google Sheets connection"""
+    
+    # Columns the dashboard reads; sources that support it skip everything else
+    SOURCE_COLUMNS = ['Date', 'Total_Signal', 'Finished', 'TP', 'SL', 'Winrate_pct']
+    
+    # Canonical schema of the cleaned frame; the raw Date/Winrate strings are dropped
+    COMPACT_DTYPES = {
+        'Date_parsed': 'datetime64[ns]',
+        'Total_Signal': np.int32,
+        'Finished': np.int32,
+        'TP': np.int32,
+        'SL': np.int32,
+        'Winrate_num': np.float32,
+    }
+    
+    # Raw signal-count columns, parsed straight into their COMPACT_DTYPES arrays
+    COUNT_COLUMNS = ['Total_Signal', 'Finished', 'TP', 'SL']
+    # Counts outside the int32 range (a timestamp typed into a count cell) would wrap
+    COUNT_MIN, COUNT_MAX = int(np.iinfo(np.int32).min), int(np.iinfo(np.int32).max)
+    NON_DIGITS = re.compile(r'[^\d]')
+    
+    def __init__(self):
+        self._sheet = None
+    
+    def connect_to_gsheet(self, sheet_name: Optional[str] = None):
+        """Establish connection to a Google Sheets worksheet (Config.SHEET_NAME by default)"""
+        try:
+            return get_client_manager().worksheet(sheet_name or Config.SHEET_NAME)
+        except Exception as e:
+            # Also reached from background loads, so report to the log rather than a page
+            print(f"❌ Google Sheets connection error: {e}")
+            raise e
+    
+    def _get_credentials(self) -> Dict[str, Any]:
+        """Get Google Sheets credentials – prefer secret files, then ENV (no st.secrets for production)."""
+
+        # 1) Secret Files di Render (recommended untuk production)
+        secret_file_paths = [
+            "/etc/secrets/google_credentials.json",
+            "/etc/secrets/credentials.json", 
+            "/etc/secrets/service_account.json"
+        ]
+        
+        for file_path in secret_file_paths:
+            try:
+                if os.path.exists(file_path):
+                    print(f"✅ Found secret file: {file_path}")
+                    with open(file_path, 'r') as f:
+                        credentials_data = json.load(f)
+                    print("✅ Successfully loaded credentials from secret file")
+                    return credentials_data
+            except Exception as e:
+                print(f"❌ Error reading secret file {file_path}: {e}")
+
+        # 2) Single JSON in ENV (backup method)
+        cj = get_secret("CREDENTIALS_JSON")
+        if cj:
+            print("✅ Using CREDENTIALS_JSON environment variable")
+            # Hapus quote pembungkus jika ada
+            cj = cj.strip().strip("'").strip('"')
+            return json.loads(cj)
+
+        # 3) Compose from split ENV vars
+        fields = [
+            "type","project_id","private_key_id","private_key","client_email","client_id",
+            "auth_uri","token_uri","auth_provider_x509_cert_url","client_x509_cert_url","universe_domain"
+        ]
+        data = {k: get_secret(k) for k in fields}
+
+        # Normalisasi private_key (ubah \n menjadi newline asli)
+        pk = data.get("private_key")
+        if pk:
+            print("✅ Found private_key in environment variables")
+            # Jika Render menyimpan \n literal, ini akan menjadi baris sebenarnya
+            data["private_key"] = pk.replace("\\n", "\n").strip()
+
+            # Jangan karang header/footer—cukup validasi ada BEGIN/END
+            if "BEGIN PRIVATE KEY" not in data["private_key"] or "END PRIVATE KEY" not in data["private_key"]:
+                raise ValueError("Service account private_key missing BEGIN/END headers.")
+
+        # Set default values for missing optional fields
+        data["type"] = data.get("type") or "service_account"
+        data["auth_uri"] = data.get("auth_uri") or "https://accounts.google.com/o/oauth2/auth"
+        data["token_uri"] = data.get("token_uri") or "https://oauth2.googleapis.com/token"
+        data["auth_provider_x509_cert_url"] = data.get("auth_provider_x509_cert_url") or "https://www.googleapis.com/oauth2/v1/certs"
+
+        required = ["type","project_id","private_key","client_email","token_uri"]
+        if all(data.get(k) for k in required):
+            print("✅ Successfully constructed credentials from individual environment variables")
+            # Filter out None values
+            return {k: v for k, v in data.items() if v is not None}
+
+        # Debug info
+        available_env_vars = [k for k in fields if get_secret(k)]
+        available_secret_files = [f for f in secret_file_paths if os.path.exists(f)]
+        
+        print(f"Available environment variables: {available_env_vars}")
+        print(f"Available secret files: {available_secret_files}")
+        
+        raise ValueError("""
+        Google Sheets credentials not found in any location:
+        1. Secret files: /etc/secrets/google_credentials.json
+        2. Environment variables: CREDENTIALS_JSON
+        3. Individual env vars: type, project_id, private_key, client_email
+        
+        For local development, use .streamlit/secrets.toml
+        """)
+    
+    def get_sheet_data(self) -> Optional[pd.DataFrame]:
+        """Get cleaned trading data, served from the process-wide cache"""
+        try:
+            return get_data_cache().get(self._load_data)
+        except EmptyDataError:
+            # Nothing cached yet and an empty sheet; the page shows its no-data warning
+            return None
+        except Exception as e:
+            st.error(f"Error fetching data: {str(e)}")
+            return None
+    
+    def invalidate_cache(self):
+        """Force the next get_sheet_data call to refetch from Google Sheets"""
+        get_data_cache().invalidate()
+    
+    def get_data_status(self) -> Dict[str, Any]:
+        """Source and freshness of the data served by get_sheet_data"""
+        return get_data_cache().status()
+    
+    def start_background_refresh(self):
+        """Start the process-wide refresher that keeps the data cache warm"""
+        if Config.BACKGROUND_REFRESH:
+            get_data_refresher().start()
+    
+    def get_refresher_health(self) -> Dict[str, Any]:
+        """Health of the background refresher (last success, last error, latency)"""
+        return get_data_refresher().health()
+    
+    def get_client_health(self) -> Dict[str, Any]:
+        """Credential, token refresh and reconnect state of the Sheets clients"""
+        return get_client_manager().health()
+    
+    def _load_data(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Refresh a cache entry from the configured sheet or, when set, every strategy sheet"""
+        if Config.STRATEGIES:
+            return self._load_strategies(entry)
+        return self._load_source(entry, get_data_source())
+    
+    def _load_strategies(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch and clean every strategy concurrently, then merge them into one tagged frame
+        
+        Each strategy keeps its own sub-entry (and sync state) under ``strategies``;
+        the merged frame carries a ``Strategy`` column that StrategyViews splits on,
+        and ``attrs['strategy_versions']`` with each strategy's own content hash.
+        A strategy that fails to load keeps its previous frame (or is left out)
+        with the error recorded on its sub-entry.
+        """
+        # Errors recorded on the last attempt are dropped before retrying
+        previous = {name: {key: value for key, value in sub_entry.items() if key not in ('error', 'error_at')}
+                    for name, sub_entry in (entry.get('strategies') or {}).items()}
+        sources = {name: get_data_source(target) for name, target in Config.STRATEGIES.items()}
+        
+        with get_metrics().timer('load_strategies'), ThreadPoolExecutor(
+                max_workers=max(min(len(sources), Config.STRATEGY_FETCH_WORKERS), 1),
+                thread_name_prefix='luxquant-strategy') as pool:
+            futures = {
+                name: pool.submit(self._load_source, previous.get(name, {}), source)
+                for name, source in sources.items()
+            }
+            results = {}
+            errors = []
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    errors.append(e)
+                    results[name] = {**previous.get(name, {}), 'error': str(e), 'error_at': time.time()}
+                    get_metrics().increment('strategy_load_failures', strategy=name)
+                    print(f"❌ Loading strategy '{name}' failed: {e}")
+        
+        loaded = {name: result for name, result in results.items() if result.get('df') is not None}
+        for name, result in loaded.items():
+            get_metrics().set_gauge('rows', len(result['df']), stage='strategy', strategy=name)
+        if not loaded:
+            if errors:
+                raise errors[0]
+            return {'df': None, 'strategies': results}
+        
+        content_hash = hashlib.sha1(json.dumps(
+            {name: result.get('content_hash') for name, result in loaded.items()}, sort_keys=True
+        ).encode('utf-8')).hexdigest()
+        
+        if entry.get('df') is not None and entry.get('content_hash') == content_hash:
+            df = entry['df']
+        else:
+            with get_metrics().timer('merge_strategies'):
+                df = pd.concat([result['df'].assign(Strategy=name) for name, result in loaded.items()],
+                               ignore_index=True)
+                df['Strategy'] = pd.Categorical(df['Strategy'], categories=list(loaded))
+                if 'Date_parsed' in df.columns and not df['Date_parsed'].isna().all():
+                    df = df.sort_values('Date_parsed', kind='stable', ignore_index=True)
+                df.attrs['strategy_versions'] = {name: result.get('content_hash') for name, result in loaded.items()}
+        
+        return {'df': df, 'content_hash': content_hash, 'strategies': results}
+    
+    def _load_source(self, entry: Dict[str, Any], source: DataSource) -> Dict[str, Any]:
+        """Refresh one source's entry, appending new rows when only the tail of the sheet grew"""
+        sync = entry.get('sync')
+        
+        # Local stores report a cheap change token; skip the read when nothing moved
+        token = self._source_token(source)
+        if entry.get('df') is not None and sync and token is not None and sync.get('token') == token:
+            get_metrics().increment('data_loads', mode='unchanged')
+            return entry
+        
+        if (Config.INCREMENTAL_SYNC and source.supports_incremental and entry.get('df') is not None and sync
+                and time.monotonic() - sync['full_synced_at'] < Config.FULL_RESYNC_INTERVAL):
+            try:
+                updated = self._load_incremental(entry, source)
+                if updated is not None:
+                    get_metrics().increment('data_loads', mode='incremental')
+                    return updated
+            except Exception as e:
+                print(f"❌ Incremental sync failed, falling back to full reload: {e}")
+        
+        get_metrics().increment('data_loads', mode='full')
+        return self._load_full(entry, source)
+    
+    def _load_full(self, entry: Dict[str, Any], source: DataSource) -> Dict[str, Any]:
+        """Download the whole worksheet, skipping the rebuild if nothing changed"""
+        token = self._source_token(source)
+        with get_metrics().timer('source_read'):
+            all_values = source.read(self.SOURCE_COLUMNS, self._history_start())
+        
+        if not all_values or len(all_values) < 2:
+            return {'df': None}
+        
+        header_row = all_values[0]
+        data_rows = all_values[1:]
+        
+        # Find last row with data
+        last_index = self._find_last_data_row(data_rows)
+        valid_data_rows = data_rows[:last_index + 1] if data_rows else []
+        
+        if not valid_data_rows:
+            return {'df': None}
+        
+        with get_metrics().timer('hash_rows'):
+            hasher = DataCache.hash_rows([header_row] + valid_data_rows)
+            content_hash = hasher.hexdigest()
+        get_metrics().set_gauge('rows', len(valid_data_rows), stage='source')
+        
+        if entry.get('df') is not None and entry.get('content_hash') == content_hash:
+            df = entry['df']
+        else:
+            with get_metrics().timer('clean_dataframe'):
+                df = self._build_dataframe(header_row, valid_data_rows)
+        
+        return {
+            'df': df,
+            'content_hash': content_hash,
+            'sync': {
+                'header': header_row,
+                'row_count': len(valid_data_rows),
+                'tail': self._fingerprint_rows(valid_data_rows[-Config.SYNC_OVERLAP_ROWS:]),
+                'hasher': hasher,
+                'full_synced_at': time.monotonic(),
+                'token': token,
+            },
+        }
+    
+    def _load_incremental(self, entry: Dict[str, Any], source: DataSource) -> Optional[Dict[str, Any]]:
+        """Fetch only rows past the last sync; returns None when a full reload is needed"""
+        sync = entry['sync']
+        header_row = sync['header']
+        width = len(header_row)
+        overlap = min(Config.SYNC_OVERLAP_ROWS, sync['row_count'])
+        
+        # Sheet row numbers are 1-based and row 1 is the header
+        start_row = sync['row_count'] - overlap + 2
+        with get_metrics().timer('source_read_incremental'):
+            values = source.get_rows_from(start_row, width)
+        rows = [(list(row) + [''] * width)[:width] for row in values]
+        
+        # Earlier rows were edited or deleted - the append-only assumption no longer holds
+        if len(rows) < overlap or self._fingerprint_rows(rows[:overlap]) != sync['tail']:
+            return None
+        
+        new_rows = rows[overlap:]
+        if not any(any(row[:6]) for row in new_rows):
+            return entry
+        
+        new_rows = new_rows[:self._find_last_data_row(new_rows) + 1]
+        
+        with get_metrics().timer('clean_dataframe_incremental'):
+            delta = self._apply_history_window(self._ingest_rows(header_row, new_rows, sync['row_count']))
+            
+            df = pd.concat([entry['df'], delta])
+            if 'Date_parsed' in df.columns and not df['Date_parsed'].isna().all():
+                df = df.sort_values('Date_parsed', kind='stable')
+        get_metrics().set_gauge('rows', sync['row_count'] + len(new_rows), stage='source')
+        
+        hasher = DataCache.hash_rows(new_rows, sync['hasher'])
+        tail_rows = (rows[:overlap] + new_rows)[-Config.SYNC_OVERLAP_ROWS:]
+        
+        return {
+            'df': df,
+            'content_hash': hasher.hexdigest(),
+            'sync': {
+                **sync,
+                'row_count': sync['row_count'] + len(new_rows),
+                'tail': self._fingerprint_rows(tail_rows),
+                'hasher': hasher,
+            },
+        }
+    
+    def _source_token(self, source: DataSource) -> Optional[tuple]:
+        """Change token of the source combined with the history window it was read for"""
+        token = source.change_token()
+        return None if token is None else (token, self._history_start())
+    
+    @staticmethod
+    def _history_start() -> Optional[datetime.date]:
+        """First date to load under Config.HISTORY_DAYS, or None for the full history"""
+        if Config.HISTORY_DAYS <= 0:
+            return None
+        return datetime.date.today() - datetime.timedelta(days=Config.HISTORY_DAYS)
+    
+    def _apply_history_window(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Drop rows before the history window for sources that could not filter"""
+        start = self._history_start()
+        if start is None or 'Date_parsed' not in df.columns:
+            return df
+        return df[df['Date_parsed'] >= pd.Timestamp(start)]
+    
+    @staticmethod
+    def _fingerprint_rows(rows: list) -> str:
+        """Fingerprint a block of raw rows to detect edits to already-synced data"""
+        return DataCache.hash_rows(rows).hexdigest()
+    
+    def _build_dataframe(self, header_row: list, data_rows: list) -> Optional[pd.DataFrame]:
+        """Convert raw sheet rows into the cleaned DataFrame"""
+        df = self._apply_history_window(self._ingest_rows(header_row, data_rows))
+        
+        return df if not df.empty else None
+    
+    def _find_last_data_row(self, data_rows: list) -> int:
+        """Find the last row containing data"""
+        last_index = 0
+        for i, row in enumerate(data_rows):
+            if any(row[:6]):  # Check first 6 columns for data
+                last_index = i
+        return last_index
+    
+    @staticmethod
+    def _iter_data_rows(data_rows: list) -> Iterator[tuple]:
+        """(position, row) for every row with data in its first six cells"""
+        for position, row in enumerate(data_rows):
+            if any(row[:6]):
+                yield position, row
+    
+    def _ingest_rows(self, header_row: list, data_rows: list, start_index: int = 0) -> pd.DataFrame:
+        """Parse raw rows straight into the compact, date-sorted frame
+        
+        Rows are walked once, blank ones skipped inline, and every cell is
+        written into a preallocated typed array; the frame is only assembled
+        at the end. Row positions (offset by ``start_index``) become the index.
+        """
+        positions = self._ingest_columns(header_row)
+        capacity = len(data_rows)
+        index = np.empty(capacity, dtype=np.int64)
+        counts = [(positions[col], col, np.zeros(capacity, dtype=self.COMPACT_DTYPES[col]))
+                  for col in self.COUNT_COLUMNS if col in positions]
+        winrate_col = positions.get('Winrate_pct')
+        winrate = np.zeros(capacity if winrate_col is not None else 0, dtype=self.COMPACT_DTYPES['Winrate_num'])
+        date_col = positions.get('Date')
+        dates = np.empty(capacity if date_col is not None else 0, dtype=object)
+        
+        parse_count, parse_winrate = self._parse_count, self._parse_winrate
+        rows = overflows = 0
+        for position, row in self._iter_data_rows(data_rows):
+            width = len(row)
+            index[rows] = start_index + position
+            for col, _, values in counts:
+                count = parse_count(row[col] if col < width else '')
+                if count is None:
+                    overflows += 1
+                    count = 0
+                values[rows] = count
+            if winrate_col is not None:
+                winrate[rows] = parse_winrate(row[winrate_col] if winrate_col < width else '')
+            if date_col is not None:
+                dates[rows] = row[date_col] if date_col < width else ''
+            rows += 1
+        
+        if overflows:
+            print(f"⚠️ {overflows} count cells were outside the int32 range and read as 0")
+        columns = {}
+        if date_col is not None:
+            columns['Date_parsed'] = self._parse_date_cells(dates[:rows])
+        for _, name, values in counts:
+            columns[name] = values[:rows]
+        if winrate_col is not None:
+            columns['Winrate_num'] = winrate[:rows]
+        df = pd.DataFrame(columns, index=index[:rows])
+        
+        # Sort by date if available
+        if 'Date_parsed' in df.columns and not df['Date_parsed'].isna().all():
+            df = df.sort_values('Date_parsed')
+        
+        return df
+    
+    def _ingest_columns(self, header_row: list) -> Dict[str, int]:
+        """Position in the raw header of each standard column, named the way _map_columns names them"""
+        names = [str(name).strip() for name in header_row]
+        mapped = self._map_columns(pd.DataFrame(columns=names)).columns
+        positions = {}
+        for position, name in enumerate(mapped):
+            if name in self.SOURCE_COLUMNS and name not in positions:
+                positions[name] = position
+        return positions
+    
+    @staticmethod
+    def _parse_count(cell) -> Optional[int]:
+        """Signal count of one cell: numbers as they are, text with every non-digit stripped
+        
+        Returns None for a count the int32 column cannot hold, instead of letting it wrap.
+        """
+        if isinstance(cell, str):
+            if not (cell.isascii() and cell.isdigit()):
+                cell = DataManager.NON_DIGITS.sub('', cell)
+            value = int(cell) if cell else 0
+        elif cell is None or cell != cell:
+            return 0
+        else:
+            value = int(cell)
+        return value if DataManager.COUNT_MIN <= value <= DataManager.COUNT_MAX else None
+    
+    @staticmethod
+    def _parse_winrate(cell) -> float:
+        """Winrate percentage of one cell; blanks and unparseable text count as 0"""
+        if cell is None:
+            return 0.0
+        if isinstance(cell, str):
+            try:
+                value = float(cell.replace('%', '').strip())
+            except ValueError:
+                return 0.0
+        else:
+            value = float(cell)
+        return value if value == value else 0.0
+    
+    @staticmethod
+    def display_dates(dates: pd.Series) -> np.ndarray:
+        """ISO day strings for a Date_parsed column, empty where undated"""
+        values = pd.to_datetime(dates, errors='coerce').to_numpy(dtype='datetime64[ns]')
+        text = np.datetime_as_string(values, unit='D').astype(object)
+        text[np.isnat(values)] = ''
+        return text
+    
+    @staticmethod
+    def to_display_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """Table columns in sheet layout, formatted from the compact frame on demand"""
+        columns = {}
+        if 'Date' in df.columns:
+            # Snapshots written before the compact schema still carry the raw strings
+            columns['Date'] = df['Date']
+        elif 'Date_parsed' in df.columns:
+            columns['Date'] = DataManager.display_dates(df['Date_parsed'])
+        for col in ['Total_Signal', 'Finished', 'TP', 'SL']:
+            if col in df.columns:
+                columns[col] = df[col]
+        if 'Winrate_pct' in df.columns:
+            columns['Winrate_pct'] = df['Winrate_pct']
+        elif 'Winrate_num' in df.columns:
+            columns['Winrate_pct'] = df['Winrate_num'].astype(np.float64).round(1).astype(str) + '%'
+        return pd.DataFrame(columns, index=df.index)
+    
+    @staticmethod
+    def standard_column(name: str) -> Optional[str]:
+        """Standard column a sheet header maps to, or None if the dashboard ignores it"""
+        col_lower = name.lower().strip()
+        if any(keyword in col_lower for keyword in ['date', 'tanggal', 'tgl']):
+            return 'Date'
+        if any(keyword in col_lower for keyword in ['total', 'signal']):
+            return 'Total_Signal'
+        if 'finish' in col_lower:
+            return 'Finished'
+        if col_lower == 'tp':
+            return 'TP'
+        if col_lower == 'sl':
+            return 'SL'
+        if any(keyword in col_lower for keyword in ['winrate', 'win_rate', 'win rate']):
+            return 'Winrate_pct'
+        return None
+    
+    def _map_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Map column names to standard format
+        
+        A header already named after a standard column keeps it; otherwise the
+        first header that normalizes to it (e.g. 'Winrate', 'Total Signal') is renamed.
+        """
+        taken = set(df.columns)
+        column_mapping = {}
+        for col in df.columns:
+            standard = self.standard_column(col)
+            if standard and standard not in taken:
+                column_mapping[col] = standard
+                taken.add(standard)
+        
+        return df.rename(columns=column_mapping)
+    
+    def _parse_date_cells(self, cells: np.ndarray) -> np.ndarray:
+        """Parse raw date cells into datetime64[ns], NaT where blank"""
+        cells = pd.Series(cells, dtype=object)
+        date_strings = cells.astype(str).str.strip()
+        empty_mask = (cells.isna() | (date_strings == '')).to_numpy()
+        
+        # Parse each distinct date string once, then broadcast back to rows
+        codes, uniques = pd.factorize(date_strings)
+        parsed_uniques = self._parse_date_series(pd.Series(uniques, dtype=object))
+        parsed = parsed_uniques.to_numpy()[codes]
+        parsed[empty_mask] = np.datetime64('NaT')
+        
+        # Default fallback: place unparseable rows relative to today by position
+        fallback_mask = np.isnat(parsed) & ~empty_mask
+        if fallback_mask.any():
+            days_back = len(cells) - np.flatnonzero(fallback_mask) - 1
+            # Keep very old positions inside the datetime64[ns] range
+            days_back = np.minimum(days_back, 100_000)
+            base_dates = (pd.Timestamp(datetime.datetime.now())
+                          - pd.to_timedelta(days_back, unit='D')).to_numpy()
+            parsed[fallback_mask] = base_dates
+        
+        return parsed
+    
+    def _parse_date_series(self, date_strings: pd.Series) -> pd.Series:
+        """Parse a Series of date strings, trying each supported format in order"""
+        parsed = pd.Series(pd.NaT, index=date_strings.index, dtype='datetime64[ns]')
+        
+        # Handle date ranges (MM/DD-MM/DD) using the end date in the current year
+        current_year = str(datetime.datetime.now().year)
+        ranges = date_strings.str.extract(r'(\d{2})/(\d{2})-(\d{2})/(\d{2})')
+        parsed = parsed.fillna(self._to_datetime_parts(current_year, ranges[2], ranges[3]))
+        
+        # Handle standard date formats as (pattern, year group, month group, day group)
+        date_patterns = [
+            (r'(\d{4})-(\d{1,2})-(\d{1,2})', 0, 1, 2),
+            (r'(\d{1,2})/(\d{1,2})/(\d{4})', 2, 0, 1),
+            (r'(\d{1,2})-(\d{1,2})-(\d{4})', 2, 0, 1),
+        ]
+        
+        for pattern, year_group, month_group, day_group in date_patterns:
+            pending = parsed.isna()
+            if not pending.any():
+                return parsed
+            parts = date_strings[pending].str.extract(pattern)
+            parsed = parsed.fillna(
+                self._to_datetime_parts(parts[year_group], parts[month_group], parts[day_group])
+            )
+        
+        # Try pandas parsing for anything left. utc=True keeps the result datetime64 even
+        # when cells carry different UTC offsets (mixed offsets otherwise come back as an
+        # object series without .dt); offset-bearing times are compared in UTC
+        pending = parsed.isna() & (date_strings != '')
+        if pending.any():
+            fallback = pd.to_datetime(date_strings[pending], errors='coerce', format='mixed', utc=True)
+            parsed = parsed.fillna(fallback.dt.tz_localize(None))
+        
+        return parsed
+    
+    @staticmethod
+    def _to_datetime_parts(year, month, day) -> pd.Series:
+        """Build datetimes from extracted year/month/day parts, NaT where invalid"""
+        text = year + '-' + month.str.zfill(2) + '-' + day.str.zfill(2)
+        return pd.to_datetime(text, format='%Y-%m-%d', errors='coerce')
+
+# ==================== BACKGROUND REFRESHER ====================
+class DataRefresher:
+    """Single per-process thread that keeps the data cache warm
+    
+    Polls on a jittered interval and backs off exponentially while the
+    loader keeps failing, so user reruns only ever read the cached frame.
+    """
+    
+    def __init__(self, cache: DataCache, loader: Callable[[Dict[str, Any]], Dict[str, Any]],
+                 interval: int, jitter: float, max_backoff: int):
+        self.cache = cache
+        self.loader = loader
+        self.interval = interval
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._health: Dict[str, Any] = {
+            'last_success': None,
+            'last_error': None,
+            'last_error_at': None,
+            'last_latency': None,
+            'consecutive_failures': 0,
+            'next_run_at': None,
+        }
+    
+    def start(self):
+        """Start the polling thread if it is not already running"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="luxquant-data-refresher", daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        """Ask the polling thread to exit after its current fetch"""
+        self._stop.set()
+    
+    def health(self) -> Dict[str, Any]:
+        """Last success, last error and fetch latency for monitoring"""
+        with self._lock:
+            health = dict(self._health)
+            health['running'] = self._thread is not None and self._thread.is_alive()
+        return health
+    
+    def _next_delay(self, failures: int) -> float:
+        """Polling interval, doubled per consecutive failure and jittered"""
+        delay = min(self.interval * (2 ** failures), self.max_backoff) if failures else self.interval
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+    
+    def _run(self):
+        """Poll until stopped, publishing each result to the cache"""
+        delay = 0.0
+        while not self._stop.wait(delay):
+            started = time.monotonic()
+            try:
+                self.cache.refresh(self.loader)
+                with self._lock:
+                    self._health['last_success'] = time.time()
+                    self._health['last_latency'] = time.monotonic() - started
+                    self._health['consecutive_failures'] = 0
+            except Exception as e:
+                with self._lock:
+                    self._health['last_error'] = str(e)
+                    self._health['last_error_at'] = time.time()
+                    self._health['last_latency'] = time.monotonic() - started
+                    self._health['consecutive_failures'] += 1
+                print(f"❌ Scheduled data refresh failed: {e}")
+            
+            with self._lock:
+                delay = self._next_delay(self._health['consecutive_failures'])
+                self._health['next_run_at'] = time.time() + delay
+
+@st.cache_resource
+def get_data_refresher() -> DataRefresher:
+    """Shared background refresher for this process"""
+    return DataRefresher(
+        get_data_cache(),
+        DataManager()._load_data,
+        Config.REFRESH_INTERVAL,
+        Config.REFRESH_JITTER,
+        Config.REFRESH_MAX_BACKOFF,
+    )
+
+# ==================== PERIOD AGGREGATES ====================
+class PeriodAggregates:
+    """Cumulative sums over date-sorted rows, built once per data version
+    
+    Any window resolves to a row range ``[start, end)`` with a binary search,
+    and its totals to two lookups per cumulative array.
+    """
+    
+    def __init__(self, df: pd.DataFrame):
+        self.row_count = len(df)
+        self.has_dates = 'Date_parsed' in df.columns and not df['Date_parsed'].isna().all()
+        
+        if self.has_dates:
+            dates = pd.to_datetime(df['Date_parsed'], errors='coerce').to_numpy()
+            self.dated_count = self.dated_prefix(dates)
+            self.dates = dates[:self.dated_count]
+        else:
+            self.dated_count = 0
+            self.dates = np.array([], dtype='datetime64[ns]')
+        
+        self.cumulative = {}
+        for col in ['TP', 'SL', 'Total_Signal']:
+            if col in df.columns:
+                values = pd.to_numeric(df[col], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+                self.cumulative[col] = np.concatenate(([0.0], np.cumsum(values)))
+    
+    @staticmethod
+    def dated_prefix(dates: np.ndarray) -> int:
+        """Number of leading rows with a date
+        
+        Rows are date-sorted with missing dates last, so valid dates form a prefix.
+        """
+        return int((~np.isnat(dates)).sum())
+    
+    def window_bounds(self, start_date: Optional[datetime.datetime] = None,
+                      end_date: Optional[datetime.datetime] = None,
+                      tail_rows: Optional[int] = None) -> tuple:
+        """Row range for a date window, falling back to the last tail_rows rows if it is empty"""
+        if start_date is None and end_date is None:
+            return 0, self.row_count
+        
+        if self.has_dates:
+            start, end = self.date_bounds(start_date, end_date)
+            if start < end or not tail_rows:
+                return start, end
+        elif not tail_rows:
+            return 0, 0
+        
+        return max(self.row_count - tail_rows, 0), self.row_count
+    
+    def date_bounds(self, start_date: Optional[datetime.datetime] = None,
+                    end_date: Optional[datetime.datetime] = None) -> tuple:
+        """Row range for dated rows with start_date <= date <= end_date"""
+        start = 0
+        end = self.dated_count
+        if start_date is not None:
+            start = int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start_date)), side='left'))
+        if end_date is not None:
+            end = int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end_date)), side='right'))
+        return start, max(start, end)
+    
+    def totals(self, start: int, end: int) -> Dict[str, float]:
+        """Column sums over rows [start, end)"""
+        return {col: cum[end] - cum[start] for col, cum in self.cumulative.items()}
+
+@st.cache_resource(max_entries=Config.VIEW_CACHE_ENTRIES)
+def get_period_aggregates(data_version: str, _df: pd.DataFrame) -> PeriodAggregates:
+    """Aggregates shared by every session viewing the same data version"""
+    with get_metrics().timer('period_aggregates'):
+        return PeriodAggregates(_df)
+
+# ==================== STRATEGY VIEWS ====================
+class StrategyViews:
+    """Per-strategy and combined frames split out of the merged multi-strategy frame
+    
+    Every view keeps the single-sheet layout and its own data version, so the
+    period aggregates, render frames and figure caches work on it unchanged.
+    A strategy's version follows its own content hash, so a change in one
+    strategy leaves the other views' caches warm. The combined view sums all
+    strategies per day, recomputes the winrate and follows the merged version.
+    """
+    
+    COMBINED = '__combined__'
+    COMBINED_LABEL = "🧩 All Strategies"
+    SUM_COLUMNS = ['Total_Signal', 'Finished', 'TP', 'SL']
+    
+    def __init__(self, df: pd.DataFrame):
+        data_version = df.attrs.get('data_version')
+        strategy_versions = df.attrs.get('strategy_versions') or {}
+        strategies = df['Strategy']
+        if isinstance(strategies.dtype, pd.CategoricalDtype):
+            self.names = [name for name in strategies.cat.categories if (strategies == name).any()]
+        else:
+            self.names = list(pd.unique(strategies))
+        self.frames = {name: df[df['Strategy'] == name] for name in self.names}
+        self.frames[self.COMBINED] = self.combine_daily(df)
+        for name, frame in self.frames.items():
+            # Snapshots may lack the per-strategy hashes; fall back to the merged version
+            version = strategy_versions.get(name) or data_version
+            frame.attrs = {'data_version': f"{version}:{name}"} if version else {}
+    
+    def get(self, strategy: Optional[str]) -> Optional[pd.DataFrame]:
+        """Frame for one strategy, or the combined view when strategy is None"""
+        return self.frames.get(strategy or self.COMBINED)
+    
+    @classmethod
+    def combine_daily(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """Sum the signal counts of every strategy per calendar day"""
+        if 'Date_parsed' not in df.columns:
+            return df.drop(columns='Strategy')
+        
+        columns = [col for col in cls.SUM_COLUMNS if col in df.columns]
+        days = pd.to_datetime(df['Date_parsed'], errors='coerce').dt.normalize().rename('Date_parsed')
+        combined = (df[columns].apply(pd.to_numeric, errors='coerce').fillna(0)
+                    .groupby(days, dropna=False, sort=True).sum()
+                    .astype(np.int32).reset_index())
+        
+        if 'TP' in combined.columns and 'SL' in combined.columns:
+            finished = (combined['TP'] + combined['SL']).replace(0, np.nan)
+            combined['Winrate_num'] = (100 * combined['TP'] / finished).fillna(0).round(1).astype(np.float32)
+        return combined
+
+@st.cache_resource(max_entries=4)
+def get_strategy_views(data_version: str, _df: pd.DataFrame) -> StrategyViews:
+    """Strategy views shared by every session viewing the same data version"""
+    with get_metrics().timer('strategy_views'):
+        return StrategyViews(_df)
+
+# ==================== ROLLING METRICS ====================
+class RollingMetrics:
+    """Rolling winrates, streaks, drawdowns and a volatility band over the sorted frame
+    
+    Every row's trailing date window is found with one vectorized searchsorted
+    and summed through cumulative arrays, so building costs O(n log n) once per
+    data version and any row range is summarized in a single numpy pass.
+    """
+    
+    # Trailing windows in days for the rolling winrate
+    WINDOWS_DAYS = (7, 30)
+    # Volatility band: rolling mean +/- BAND_WIDTH standard deviations of the daily winrate
+    BAND_DAYS = 30
+    BAND_WIDTH = 1.0
+    
+    def __init__(self, df: pd.DataFrame):
+        self.row_count = len(df)
+        self.tp = self._column(df, 'TP')
+        self.sl = self._column(df, 'SL')
+        
+        if 'Date_parsed' in df.columns:
+            self.dates = pd.to_datetime(df['Date_parsed'], errors='coerce').to_numpy(dtype='datetime64[ns]')
+        else:
+            self.dates = np.full(self.row_count, np.datetime64('NaT'), dtype='datetime64[ns]')
+        dated_count = PeriodAggregates.dated_prefix(self.dates)
+        
+        finished = self.tp + self.sl
+        self.daily_winrate = np.full(self.row_count, np.nan)
+        np.divide(100 * self.tp, finished, out=self.daily_winrate, where=finished > 0)
+        
+        cum_tp = np.concatenate(([0.0], np.cumsum(self.tp)))
+        cum_sl = np.concatenate(([0.0], np.cumsum(self.sl)))
+        self.rolling_winrate = {}
+        for days in self.WINDOWS_DAYS:
+            lo, hi = self._window_starts(days, dated_count), np.arange(1, self.row_count + 1)
+            tp_sum = cum_tp[hi] - cum_tp[lo]
+            total = tp_sum + (cum_sl[hi] - cum_sl[lo])
+            winrate = np.full(self.row_count, np.nan)
+            np.divide(100 * tp_sum, total, out=winrate, where=total > 0)
+            self.rolling_winrate[days] = winrate
+        
+        # Band from running sums of x and x^2 over days that closed at least one signal
+        valid = ~np.isnan(self.daily_winrate)
+        values = np.where(valid, self.daily_winrate, 0.0)
+        lo, hi = self._window_starts(self.BAND_DAYS, dated_count), np.arange(1, self.row_count + 1)
+        count, total, squares = (np.concatenate(([0.0], np.cumsum(a))) for a in (valid, values, values ** 2))
+        n = count[hi] - count[lo]
+        self.band_mean = np.full(self.row_count, np.nan)
+        np.divide(total[hi] - total[lo], n, out=self.band_mean, where=n > 0)
+        mean_squares = np.full(self.row_count, np.nan)
+        np.divide(squares[hi] - squares[lo], n, out=mean_squares, where=n > 0)
+        band_std = np.sqrt(np.maximum(mean_squares - self.band_mean ** 2, 0))
+        self.band_low = np.clip(self.band_mean - self.BAND_WIDTH * band_std, 0, 100)
+        self.band_high = np.clip(self.band_mean + self.BAND_WIDTH * band_std, 0, 100)
+        
+        for array in [self.tp, self.sl, self.dates, self.daily_winrate, *self.rolling_winrate.values(),
+                      self.band_mean, self.band_low, self.band_high]:
+            array.flags.writeable = False
+    
+    def summary(self, start: int, end: int) -> Dict[str, Any]:
+        """Rolling values at the last row of [start, end) plus streaks and drawdown inside it"""
+        if end <= start:
+            return {}
+        
+        tp, sl = self.tp[start:end], self.sl[start:end]
+        summary = {
+            'longest_tp_streak': self._longest_run(tp > sl),
+            'longest_sl_streak': self._longest_run(sl > tp),
+        }
+        
+        # Latest row with a defined value, since undated or empty days have none
+        for days, winrate in self.rolling_winrate.items():
+            summary[f'winrate_{days}d'] = self._last_value(winrate, start, end)
+        summary['latest_winrate'] = self._last_value(self.daily_winrate, start, end)
+        summary['band_mean'] = self._last_value(self.band_mean, start, end)
+        summary['band_low'] = self._last_value(self.band_low, start, end)
+        summary['band_high'] = self._last_value(self.band_high, start, end)
+        
+        # Worst drawdown: deepest fall of the running TP - SL balance from a prior peak
+        balance = np.concatenate(([0.0], np.cumsum(tp - sl)))
+        peaks = np.maximum.accumulate(balance)
+        trough = int(np.argmax(peaks - balance))
+        depth = float(peaks[trough] - balance[trough])
+        summary['drawdown'] = depth
+        summary['drawdown_start'] = summary['drawdown_end'] = None
+        if depth > 0:
+            peak = int(np.flatnonzero(balance[:trough + 1] == peaks[trough])[-1])
+            summary['drawdown_start'] = self._date(start + peak)
+            summary['drawdown_end'] = self._date(start + trough - 1)
+        return summary
+    
+    def _window_starts(self, days: int, dated_count: int) -> np.ndarray:
+        """First row of each row's trailing window; undated rows fall back to row counts"""
+        starts = np.maximum(np.arange(1, self.row_count + 1) - days, 0)
+        dates = self.dates[:dated_count]
+        starts[:dated_count] = np.searchsorted(dates, dates - np.timedelta64(days, 'D'), side='right')
+        return starts
+    
+    def _last_value(self, values: np.ndarray, start: int, end: int) -> Optional[float]:
+        """Last finite value in rows [start, end)"""
+        finite = np.flatnonzero(np.isfinite(values[start:end]))
+        return float(values[start + finite[-1]]) if len(finite) else None
+    
+    def _date(self, row: int) -> Optional[str]:
+        """ISO date of a row, or None if it is undated"""
+        return None if np.isnat(self.dates[row]) else str(self.dates[row].astype('datetime64[D]'))
+    
+    @staticmethod
+    def _longest_run(mask: np.ndarray) -> int:
+        """Length of the longest run of True values"""
+        if not mask.any():
+            return 0
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+        return int((edges[1::2] - edges[::2]).max())
+    
+    @staticmethod
+    def _column(df: pd.DataFrame, col: str) -> np.ndarray:
+        """Column as float64, zeros when it is missing"""
+        if col not in df.columns:
+            return np.zeros(len(df))
+        return pd.to_numeric(df[col], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+
+@st.cache_resource(max_entries=Config.VIEW_CACHE_ENTRIES)
+def get_rolling_metrics(data_version: str, _df: pd.DataFrame) -> RollingMetrics:
+    """Rolling metrics shared by every session viewing the same data version"""
+    with get_metrics().timer('rolling_metrics'):
+        return RollingMetrics(_df)
+
+@st.cache_resource(max_entries=32)
+def get_rolling_summary(data_version: str, row_window: tuple, _df: pd.DataFrame) -> Dict[str, Any]:
+    """Rolling summary of one row window, shared by every session viewing it"""
+    return get_rolling_metrics(data_version, _df).summary(*row_window)
+
+# ==================== ANALYTICS ENGINE ====================
+class AnalyticsEngine:
+    """Handles all analytics and data processing operations"""
+    
+    # Rolling windows in days; an empty window falls back to the last N rows
+    ROLLING_PERIOD_DAYS = {'week': 7, '14d': 14, 'month': 30, '90d': 90, '365d': 365}
+    
+    PERIOD_LABELS = {
+        'week': "📅 Last Week",
+        '14d': "🗓️ Last 14 Days",
+        'month': "📆 Last Month",
+        '90d': "🗓️ Last 90 Days",
+        'quarter': "📊 This Quarter",
+        'ytd': "📅 Year to Date",
+        '365d': "🗓️ Last 365 Days",
+        'all': "📈 All Time",
+        'custom': "🔎 Custom Range",
+    }
+    
+    @staticmethod
+    def resolve_period(period: str, date_range: Optional[tuple] = None,
+                       now: Optional[datetime.datetime] = None) -> tuple:
+        """Translate a period key into (start_date, end_date, tail_rows)"""
+        now = now or datetime.datetime.now()
         
-        # Calculate total signals and completion rate
+        if period in AnalyticsEngine.ROLLING_PERIOD_DAYS:
+            days = AnalyticsEngine.ROLLING_PERIOD_DAYS[period]
+            return now - datetime.timedelta(days=days), None, days
+        if period == 'ytd':
+            return datetime.datetime(now.year, 1, 1), None, None
+        if period == 'quarter':
+            return datetime.datetime(now.year, 3 * ((now.month - 1) // 3) + 1, 1), None, None
+        if period == 'custom' and date_range:
+            start_day, end_day = date_range[0], date_range[-1]
+            return (datetime.datetime.combine(start_day, datetime.time.min),
+                    datetime.datetime.combine(end_day, datetime.time.max), None)
+        return None, None, None
+    
+    @staticmethod
+    def filter_data_by_period(df: Optional[pd.DataFrame], period: str,
+                              date_range: Optional[tuple] = None) -> Optional[pd.DataFrame]:
+        """Filter DataFrame by selected time period as a row slice of the date-sorted frame"""
+        if df is None or df.empty:
+            return None
+        
+        aggregates = AnalyticsEngine.get_aggregates(df)
+        start, end = aggregates.window_bounds(*AnalyticsEngine.resolve_period(period, date_range))
+        filtered_df = df.iloc[start:end]
+        # Identifies this slice for caches keyed on (data_version, row_window)
+        filtered_df.attrs['row_window'] = (start, end)
+        return filtered_df
+    
+    @staticmethod
+    def get_aggregates(df: pd.DataFrame) -> PeriodAggregates:
+        """Period aggregates for df, shared across sessions when it carries a data version"""
+        data_version = df.attrs.get('data_version')
+        if data_version:
+            return get_period_aggregates(data_version, df)
+        return PeriodAggregates(df)
+    
+    @staticmethod
+    def get_strategy_views(df: pd.DataFrame) -> StrategyViews:
+        """Strategy views for a merged frame, shared across sessions when it carries a data version"""
+        data_version = df.attrs.get('data_version')
+        if data_version:
+            return get_strategy_views(data_version, df)
+        return StrategyViews(df)
+    
+    @staticmethod
+    def select_strategy(df: Optional[pd.DataFrame], strategy: Optional[str]) -> Optional[pd.DataFrame]:
+        """One strategy's frame, or the combined view; single-sheet frames pass through"""
+        if df is None or df.empty or 'Strategy' not in df.columns:
+            return df
+        return AnalyticsEngine.get_strategy_views(df).get(strategy)
+    
+    @staticmethod
+    def strategy_breakdown(df: Optional[pd.DataFrame], period: str,
+                           date_range: Optional[tuple] = None) -> list:
+        """Period statistics for each strategy of a merged frame"""
+        if df is None or df.empty or 'Strategy' not in df.columns:
+            return []
+        
+        views = AnalyticsEngine.get_strategy_views(df)
+        rows = []
+        for name in views.names:
+            stats = AnalyticsEngine.calculate_period_statistics(views.get(name), period, date_range)
+            if stats:
+                rows.append({'strategy': name, **stats})
+        return rows
+    
+    @staticmethod
+    def rolling_summary(df: Optional[pd.DataFrame], row_window: Optional[tuple] = None) -> Optional[Dict[str, Any]]:
+        """Rolling winrates, streaks, drawdown and volatility band for rows [start, end) of df"""
+        if df is None or df.empty:
+            return None
+        
+        row_window = tuple(row_window) if row_window else (0, len(df))
+        data_version = df.attrs.get('data_version')
+        if data_version:
+            return get_rolling_summary(data_version, row_window, df)
+        return RollingMetrics(df).summary(*row_window)
+    
+    @staticmethod
+    def calculate_period_statistics(df: Optional[pd.DataFrame], period: str,
+                                    date_range: Optional[tuple] = None) -> Optional[Dict[str, Any]]:
+        """Calculate trading statistics for a period from precomputed aggregates"""
+        if df is None or df.empty:
+            return None
+        
+        aggregates = AnalyticsEngine.get_aggregates(df)
+        start, end = aggregates.window_bounds(*AnalyticsEngine.resolve_period(period, date_range))
+        if start == end:
+            return None
+        
+        totals = aggregates.totals(start, end)
+        if 'TP' not in totals or 'SL' not in totals:
+            return None
+        
+        return AnalyticsEngine._build_statistics(totals['TP'], totals['SL'], totals.get('Total_Signal'))
+    
+    @staticmethod
+    def calculate_statistics(df: Optional[pd.DataFrame]) -> Optional[Dict[str, Any]]:
+        """Calculate trading statistics from DataFrame"""
+        if df is None or df.empty:
+            return None
+        
+        # Check required columns
+        if 'TP' not in df.columns or 'SL' not in df.columns:
+            return None
+        
+        tp_data = pd.to_numeric(df['TP'], errors='coerce').fillna(0)
+        sl_data = pd.to_numeric(df['SL'], errors='coerce').fillna(0)
+        
+        total_signals = None
         if 'Total_Signal' in df.columns:
             total_signals = pd.to_numeric(df['Total_Signal'], errors='coerce').fillna(0).sum()
+        
+        return AnalyticsEngine._build_statistics(tp_data.sum(), sl_data.sum(), total_signals)
+    
+    @staticmethod
+    def _build_statistics(tp_sum: float, sl_sum: float, total_signals: Optional[float]) -> Dict[str, Any]:
+        """Derive winrate and completion rate from column totals"""
+        stats = {
+            'total_tp': int(tp_sum),
+            'total_sl': int(sl_sum),
+        }
+        
+        # Calculate winrate
+        if stats['total_tp'] + stats['total_sl'] > 0:
+            stats['overall_winrate'] = 100 * stats['total_tp'] / (stats['total_tp'] + stats['total_sl'])
+        else:
+            stats['overall_winrate'] = 0
+        
+        # Calculate total signals and completion rate
+        if total_signals is not None:
             stats['total_signals'] = int(total_signals)
             
             if total_signals > 0:
@@ -775,27 +3111,304 @@ class AnalyticsEngine:
         
         return stats
 
+# ==================== RENDER FRAME ====================
+class RenderFrame:
+    """Date-sorted, read-only numpy arrays shared by every chart builder"""
+    
+    SERIES_COLUMNS = ['Winrate_num', 'TP', 'SL', 'Total_Signal']
+    CUMULATIVE_COLUMNS = ['TP', 'SL']
+    
+    def __init__(self, x: np.ndarray, dates: np.ndarray, series: Dict[str, np.ndarray],
+                 cumulative: Dict[str, np.ndarray]):
+        self.x = x
+        self.dates = dates
+        self.series = series
+        self.cumulative = cumulative
+    
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'RenderFrame':
+        """Sort (only if needed), type and freeze the columns the charts plot"""
+        if 'Date_parsed' in df.columns and not df['Date_parsed'].isna().all():
+            if not df['Date_parsed'].is_monotonic_increasing:
+                df = df.sort_values('Date_parsed', kind='stable')
+        
+        if 'Date_parsed' in df.columns:
+            dates = pd.to_datetime(df['Date_parsed'], errors='coerce').to_numpy(dtype='datetime64[ns]')
+        else:
+            dates = np.full(len(df), np.datetime64('NaT'), dtype='datetime64[ns]')
+        
+        if 'Date_display' in df.columns:
+            x = df['Date_display'].to_numpy(dtype=object)
+        elif 'Date_parsed' in df.columns:
+            # Labels are formatted once per data version, not kept on the cached frame
+            x = DataManager.display_dates(df['Date_parsed'])
+        else:
+            x = np.arange(len(df))
+        
+        series = {}
+        for col in cls.SERIES_COLUMNS:
+            if col in df.columns:
+                values = pd.to_numeric(df[col], errors='coerce').fillna(0)
+                series[col] = values.to_numpy(dtype=np.float64 if col == 'Winrate_num' else np.int64)
+        
+        # Leading zero so any window's running total is cum[start + 1:end + 1] - cum[start]
+        cumulative = {
+            col: np.concatenate(([0], np.cumsum(series[col])))
+            for col in cls.CUMULATIVE_COLUMNS if col in series
+        }
+        
+        for array in [x, dates, *series.values(), *cumulative.values()]:
+            array.flags.writeable = False
+        return cls(x, dates, series, cumulative)
+    
+    def __len__(self) -> int:
+        return len(self.x)
+    
+    def has(self, *columns: str) -> bool:
+        """Whether every given series is available"""
+        return all(col in self.series for col in columns)
+    
+    def window(self, start: int, end: int) -> 'RenderFrame':
+        """Zero-copy view over rows [start, end); running totals restart at start"""
+        cumulative = {}
+        for col, cum in self.cumulative.items():
+            window_cum = cum[start:end + 1] - cum[start]
+            window_cum.flags.writeable = False
+            cumulative[col] = window_cum
+        return RenderFrame(
+            self.x[start:end],
+            self.dates[start:end],
+            {col: values[start:end] for col, values in self.series.items()},
+            cumulative,
+        )
+    
+    def running_total(self, col: str) -> np.ndarray:
+        """Cumulative sum of a series within this frame"""
+        return self.cumulative[col][1:]
+    
+    def line_points(self, lines: Dict[str, np.ndarray], point_budget: Optional[int]) -> tuple:
+        """Downsample line series with LTTB, sharing one x axis across all of them
+        
+        Returns ``(x, {name: y})``; series are untouched when within the budget.
+        """
+        if not point_budget or len(self) <= point_budget:
+            return self.x, lines
+        
+        # Union of per-series picks keeps every line's shape on a common category axis
+        picks = np.unique(np.concatenate([
+            self.lttb_indices(values, max(point_budget // len(lines), 3)) for values in lines.values()
+        ]))
+        return self.x[picks], {name: values[picks] for name, values in lines.items()}
+    
+    def bar_buckets(self, columns: list, point_budget: Optional[int]) -> tuple:
+        """Sum bar series into weekly or monthly buckets when they exceed the budget
+        
+        Returns ``(x, {column: y}, x_label)`` where x_label names the bucket size.
+        """
+        values = {col: self.series[col] for col in columns}
+        if not point_budget or len(self) <= point_budget:
+            return self.x, values, 'Date'
+        
+        if np.isnat(self.dates).all():
+            # No dates to bucket on - fall back to fixed-size row chunks
+            chunk = -(-len(self) // point_budget)
+            codes = np.arange(len(self)) // chunk
+            labels = self.x[::chunk]
+            x_label = f'{chunk}-row block from'
+        else:
+            dates = pd.Series(self.dates)
+            for freq, label_format, x_label in (('W', '%Y-%m-%d', 'Week of'), ('M', '%Y-%m', 'Month')):
+                codes, periods = pd.factorize(dates.dt.to_period(freq))
+                if len(periods) <= point_budget:
+                    break
+            labels = list(periods.start_time.strftime(label_format))
+            # Undated rows (factorize code -1) are gathered into one trailing bucket
+            if (codes < 0).any():
+                codes = np.where(codes < 0, len(labels), codes)
+                labels.append('Undated')
+            labels = np.asarray(labels, dtype=object)
+        
+        sums = {
+            col: np.bincount(codes, weights=series, minlength=len(labels)).astype(np.int64)
+            for col, series in values.items()
+        }
+        return labels, sums, x_label
+    
+    @staticmethod
+    def lttb_indices(values: np.ndarray, threshold: int) -> np.ndarray:
+        """Largest-Triangle-Three-Buckets point selection over evenly spaced rows"""
+        n = len(values)
+        if threshold >= n or threshold < 3:
+            return np.arange(n)
+        
+        y = values.astype(np.float64)
+        # threshold - 2 buckets between the always-kept first and last points
+        edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+        picks = np.empty(threshold, dtype=np.int64)
+        picks[0], picks[-1] = 0, n - 1
+        
+        anchor = 0
+        for i in range(threshold - 2):
+            start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+            next_start = edges[i + 1]
+            next_end = edges[i + 2] if i + 2 < len(edges) else n
+            next_end = max(next_end, next_start + 1)
+            
+            avg_x = (next_start + next_end - 1) / 2.0
+            avg_y = y[next_start:next_end].mean()
+            
+            xs = np.arange(start, end, dtype=np.float64)
+            areas = np.abs((anchor - avg_x) * (y[start:end] - y[anchor])
+                           - (anchor - xs) * (avg_y - y[anchor]))
+            anchor = start + int(np.argmax(areas))
+            picks[i + 1] = anchor
+        
+        return np.unique(picks)
+
+@st.cache_resource(max_entries=Config.VIEW_CACHE_ENTRIES)
+def get_render_frame(data_version: str, _df: pd.DataFrame) -> RenderFrame:
+    """Render frame shared by every session viewing the same data version"""
+    with get_metrics().timer('render_frame'):
+        return RenderFrame.from_dataframe(_df)
+
+# ==================== FIGURE CACHE ====================
+class FigureCache:
+    """Process-wide LRU cache of serialized Plotly figures"""
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._figures: OrderedDict = OrderedDict()
+        # Sessions missing on the same figure wait for one build
+        self._flight = SingleFlight('figure_build')
+    
+    def get_or_build(self, key: tuple, builder: Callable[[], Optional[go.Figure]]) -> Optional[go.Figure]:
+        """Return a fresh Figure for key, building and serializing it on a miss"""
+        figure_json = self._lookup(key)
+        
+        get_metrics().increment('figure_cache_requests', result='miss' if figure_json is None else 'hit')
+        if figure_json is None:
+            figure_json = self._flight.do(key, lambda: self._build(key, builder))
+            if figure_json is None:
+                return None
+        
+        import plotly.graph_objects as go
+        
+        # Cached JSON was produced by a validated figure, so skip re-validation
+        return go.Figure(json.loads(figure_json), _validate=False)
+    
+    def _lookup(self, key: tuple) -> Optional[str]:
+        """Cached JSON for key, marked as recently used"""
+        with self._lock:
+            figure_json = self._figures.get(key)
+            if figure_json is not None:
+                self._figures.move_to_end(key)
+            return figure_json
+    
+    def _build(self, key: tuple, builder: Callable[[], Optional[go.Figure]]) -> Optional[str]:
+        """Build, serialize and store a figure, unless a just-finished flight stored it"""
+        figure_json = self._lookup(key)
+        if figure_json is not None:
+            return figure_json
+        
+        fig = builder()
+        if fig is None:
+            return None
+        with get_metrics().timer('figure_serialize'):
+            figure_json = fig.to_json()
+        with self._lock:
+            self._figures[key] = figure_json
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return figure_json
+    
+    def clear(self):
+        """Drop every cached figure"""
+        with self._lock:
+            self._figures.clear()
+
+@st.cache_resource
+def get_figure_cache() -> FigureCache:
+    """Shared figure cache for every session in this process"""
+    return FigureCache(Config.FIGURE_CACHE_SIZE)
+
 # ==================== CHART BUILDER ====================
 class ChartBuilder:
     """Handles all chart creation and visualization"""
     
+    # Height and margins for each chart in the desktop and mobile layout variants
+    LAYOUT_VARIANTS = {
+        'combined': {
+            'desktop': dict(height=700, margin=dict(l=40, r=40, t=60, b=40)),
+            'mobile': dict(height=600, margin=dict(l=40, r=40, t=60, b=40)),
+        },
+        'winrate': {
+            'desktop': dict(height=350, margin=dict(l=40, r=40, t=50, b=40)),
+            'mobile': dict(height=300, margin=dict(l=40, r=40, t=50, b=40)),
+        },
+        'tpsl': {
+            'desktop': dict(height=350, margin=dict(l=40, r=40, t=50, b=40)),
+            'mobile': dict(height=300, margin=dict(l=40, r=40, t=50, b=40)),
+        },
+    }
+    
     @staticmethod
-    def create_winrate_chart(df: Optional[pd.DataFrame]) -> Optional[go.Figure]:
-        """Create an enhanced winrate chart with better readability"""
-        if df is None or df.empty or 'Winrate_num' not in df.columns:
+    def get_chart(chart: str, df: Optional[pd.DataFrame], row_window: Optional[tuple] = None,
+                  variant: str = 'desktop', full_resolution: bool = False) -> Optional[go.Figure]:
+        """Build a chart over rows [start, end) of df, cached by data version and row window"""
+        point_budget = None if full_resolution else Config.CHART_POINT_BUDGET
+        builders = {
+            'combined': ChartBuilder.create_combined_dashboard_chart,
+            'winrate': ChartBuilder.create_winrate_chart,
+            'tpsl': ChartBuilder.create_tpsl_chart,
+        }
+        
+        def build() -> Optional[go.Figure]:
+            frame = ChartBuilder.get_render_frame(df, row_window)
+            with get_metrics().timer(f'chart_build_{chart}'):
+                fig = builders[chart](frame, point_budget)
+                if fig is not None:
+                    fig.update_layout(**ChartBuilder.LAYOUT_VARIANTS[chart][variant])
+            return fig
+        
+        data_version = df.attrs.get('data_version') if df is not None else None
+        if not data_version:
+            return build()
+        
+        key = (data_version, row_window, chart, variant, point_budget)
+        return get_figure_cache().get_or_build(key, build)
+    
+    @staticmethod
+    def get_render_frame(df: Optional[pd.DataFrame], row_window: Optional[tuple] = None) -> Optional[RenderFrame]:
+        """Render frame for rows [start, end) of df, shared per data version"""
+        if df is None or df.empty:
             return None
         
-        if 'Date_parsed' in df.columns and not df['Date_parsed'].isna().all():
-            df = df.copy()
-            df['Date_parsed'] = pd.to_datetime(df['Date_parsed'], errors='coerce')
-            df = df.sort_values('Date_parsed')
+        data_version = df.attrs.get('data_version')
+        if data_version:
+            frame = get_render_frame(data_version, df)
+        else:
+            frame = RenderFrame.from_dataframe(df)
+        
+        frame = frame.window(*row_window) if row_window else frame
+        return frame if len(frame) else None
+    
+    @staticmethod
+    def create_winrate_chart(frame: Optional[RenderFrame], point_budget: Optional[int] = None) -> Optional[go.Figure]:
+        """Create an enhanced winrate chart with better readability"""
+        if frame is None or not len(frame) or not frame.has('Winrate_num'):
+            return None
+        import plotly.graph_objects as go
         
+        winrate = frame.series['Winrate_num']
+        x, lines = frame.line_points({'Winrate': winrate}, point_budget)
         fig = go.Figure()
         
         # Add winrate line
         fig.add_trace(go.Scatter(
-            x=df['Date_display'],
-            y=df['Winrate_num'],
+            x=x,
+            y=lines['Winrate'],
             mode='lines+markers',
             name='Winrate',
             line=dict(color=Config.COLORS['primary'], width=4),
@@ -805,7 +3418,7 @@ class ChartBuilder:
         ))
         
         # Add average line
-        avg_winrate = df['Winrate_num'].mean()
+        avg_winrate = float(winrate.mean())
         fig.add_hline(y=avg_winrate, line_dash="dash", line_color=Config.COLORS['primary'], 
                       line_width=2, annotation_text=f"Average: {avg_winrate:.1f}%", 
                       annotation_font_color=Config.COLORS['primary'], annotation_font_size=14)
@@ -834,31 +3447,28 @@ class ChartBuilder:
         return fig
     
     @staticmethod
-    def create_tpsl_chart(df: Optional[pd.DataFrame]) -> Optional[go.Figure]:
+    def create_tpsl_chart(frame: Optional[RenderFrame], point_budget: Optional[int] = None) -> Optional[go.Figure]:
         """Create TP/SL comparison chart with better readability"""
-        if df is None or df.empty or 'TP' not in df.columns or 'SL' not in df.columns:
+        if frame is None or not len(frame) or not frame.has('TP', 'SL'):
             return None
+        import plotly.graph_objects as go
         
-        if 'Date_parsed' in df.columns and not df['Date_parsed'].isna().all():
-            df = df.copy()
-            df['Date_parsed'] = pd.to_datetime(df['Date_parsed'], errors='coerce')
-            df = df.sort_values('Date_parsed')
-        
+        x, bars, x_label = frame.bar_buckets(['TP', 'SL'], point_budget)
         fig = go.Figure()
         
         # Add TP bars with Binance green
         fig.add_trace(go.Bar(
-            x=df['Date_display'], y=df['TP'], name='Take Profit',
+            x=x, y=bars['TP'], name='Take Profit',
             marker_color=Config.COLORS['success'],
-            hovertemplate='<b>Date:</b> %{x}<br><b>TP:</b> %{y}<extra></extra>',
+            hovertemplate=f'<b>{x_label}:</b> %{{x}}<br><b>TP:</b> %{{y}}<extra></extra>',
             opacity=0.9
         ))
         
         # Add SL bars with Binance red
         fig.add_trace(go.Bar(
-            x=df['Date_display'], y=df['SL'], name='Stop Loss',
+            x=x, y=bars['SL'], name='Stop Loss',
             marker_color=Config.COLORS['danger'],
-            hovertemplate='<b>Date:</b> %{x}<br><b>SL:</b> %{y}<extra></extra>',
+            hovertemplate=f'<b>{x_label}:</b> %{{x}}<br><b>SL:</b> %{{y}}<extra></extra>',
             opacity=0.9
         ))
         
@@ -882,10 +3492,12 @@ class ChartBuilder:
         return fig
     
     @staticmethod
-    def create_combined_dashboard_chart(df: Optional[pd.DataFrame]) -> Optional[go.Figure]:
+    def create_combined_dashboard_chart(frame: Optional[RenderFrame], point_budget: Optional[int] = None) -> Optional[go.Figure]:
         """Create combined dashboard chart with enhanced readability"""
-        if df is None or df.empty:
+        if frame is None or not len(frame):
             return None
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
         
         # Create subplots
         fig = make_subplots(
@@ -897,9 +3509,10 @@ class ChartBuilder:
         )
         
         # Winrate trend
-        if 'Winrate_num' in df.columns:
+        if frame.has('Winrate_num'):
+            x, lines = frame.line_points({'Winrate': frame.series['Winrate_num']}, point_budget)
             fig.add_trace(
-                go.Scatter(x=df['Date_display'], y=df['Winrate_num'], 
+                go.Scatter(x=x, y=lines['Winrate'], 
                           mode='lines+markers', name='Winrate',
                           line=dict(color=Config.COLORS['primary'], width=3),
                           marker=dict(size=6, color=Config.COLORS['primary'])),
@@ -908,38 +3521,41 @@ class ChartBuilder:
             fig.update_yaxes(range=[0, 100], row=1, col=1)
         
         # TP vs SL
-        if 'TP' in df.columns and 'SL' in df.columns:
+        if frame.has('TP', 'SL'):
+            x, bars, _ = frame.bar_buckets(['TP', 'SL'], point_budget)
             fig.add_trace(
-                go.Bar(x=df['Date_display'], y=df['TP'], name='TP', 
+                go.Bar(x=x, y=bars['TP'], name='TP', 
                        marker_color=Config.COLORS['success'], opacity=0.9),
                 row=1, col=2
             )
             fig.add_trace(
-                go.Bar(x=df['Date_display'], y=df['SL'], name='SL',
+                go.Bar(x=x, y=bars['SL'], name='SL',
                        marker_color=Config.COLORS['danger'], opacity=0.9),
                 row=1, col=2
             )
             
             # Cumulative performance
-            cumulative_tp = df['TP'].cumsum()
-            cumulative_sl = df['SL'].cumsum()
+            x, cumulative = frame.line_points(
+                {'TP': frame.running_total('TP'), 'SL': frame.running_total('SL')}, point_budget
+            )
             fig.add_trace(
-                go.Scatter(x=df['Date_display'], y=cumulative_tp, 
+                go.Scatter(x=x, y=cumulative['TP'], 
                           mode='lines', name='Cumulative TP',
                           line=dict(color=Config.COLORS['success'], width=3)),
                 row=2, col=1
             )
             fig.add_trace(
-                go.Scatter(x=df['Date_display'], y=cumulative_sl,
+                go.Scatter(x=x, y=cumulative['SL'],
                           mode='lines', name='Cumulative SL',
                           line=dict(color=Config.COLORS['danger'], width=3)),
                 row=2, col=1
             )
         
         # Daily signals
-        if 'Total_Signal' in df.columns:
+        if frame.has('Total_Signal'):
+            x, bars, _ = frame.bar_buckets(['Total_Signal'], point_budget)
             fig.add_trace(
-                go.Bar(x=df['Date_display'], y=df['Total_Signal'], 
+                go.Bar(x=x, y=bars['Total_Signal'], 
                        name='Daily Signals', marker_color=Config.COLORS['primary'], opacity=0.9),
                 row=2, col=2
             )
@@ -969,6 +3585,117 @@ class ChartBuilder:
         
         return fig
 
+# ==================== DATA TABLE ====================
+class DataTable:
+    """Server-side search, sort and pagination over a filtered trading frame
+    
+    Queries resolve to an array of row positions, cached per data version and
+    row window, so paging only formats and ships the visible rows.
+    """
+    
+    COLUMN_LABELS = {
+        'Date': '📅 Date',
+        'Total_Signal': '📊 Total Signal',
+        'Finished': '✅ Finished',
+        'TP': '🎯 TP',
+        'SL': '🛑 SL',
+        'Winrate_pct': '📈 Winrate'
+    }
+    
+    # Table column -> typed column it sorts and searches on
+    SORT_KEYS = {
+        'Date': 'Date_parsed',
+        'Total_Signal': 'Total_Signal',
+        'Finished': 'Finished',
+        'TP': 'TP',
+        'SL': 'SL',
+        'Winrate_pct': 'Winrate_num',
+    }
+    
+    @staticmethod
+    def sortable_columns(df: pd.DataFrame) -> list:
+        """Table columns whose typed source column is present"""
+        return [col for col, key in DataTable.SORT_KEYS.items() if key in df.columns]
+    
+    @staticmethod
+    def get_row_order(df: pd.DataFrame, search: str = '', sort_by: Optional[str] = None,
+                      descending: bool = False) -> np.ndarray:
+        """Row positions for a query, shared across sessions when df carries a data version"""
+        data_version = df.attrs.get('data_version')
+        if data_version:
+            return get_table_row_order(data_version, df.attrs.get('row_window'), search, sort_by, descending, df)
+        return DataTable.row_order(df, search, sort_by, descending)
+    
+    @staticmethod
+    def row_order(df: pd.DataFrame, search: str = '', sort_by: Optional[str] = None,
+                  descending: bool = False) -> np.ndarray:
+        """Positions of rows matching search, ordered by sort_by"""
+        positions = np.flatnonzero(DataTable.search_mask(df, search))
+        
+        key = DataTable.SORT_KEYS.get(sort_by)
+        if key in df.columns and len(positions):
+            values = df[key].to_numpy()[positions]
+            positions = positions[np.argsort(values, kind='stable')]
+            if descending:
+                positions = positions[::-1]
+        
+        positions.flags.writeable = False
+        return positions
+    
+    @staticmethod
+    def search_mask(df: pd.DataFrame, search: str) -> np.ndarray:
+        """Rows whose date contains the text or whose count or winrate equals it"""
+        text = search.strip()
+        if not text:
+            return np.ones(len(df), dtype=bool)
+        
+        mask = np.zeros(len(df), dtype=bool)
+        if 'Date_parsed' in df.columns:
+            dates = pd.Series(DataManager.display_dates(df['Date_parsed']), dtype=object)
+            mask |= dates.str.contains(text, regex=False).to_numpy(dtype=bool)
+        
+        try:
+            number = float(text.rstrip('%').replace(',', ''))
+        except ValueError:
+            return mask
+        for col in ['Total_Signal', 'Finished', 'TP', 'SL']:
+            if col in df.columns:
+                mask |= df[col].to_numpy() == number
+        if 'Winrate_num' in df.columns:
+            mask |= np.isclose(df['Winrate_num'].to_numpy(dtype=np.float64).round(1), number)
+        return mask
+    
+    @staticmethod
+    def page(df: pd.DataFrame, order: np.ndarray, page: int, page_size: int) -> pd.DataFrame:
+        """Labelled display frame for one 1-based page of the ordered rows"""
+        start = (page - 1) * page_size
+        return DataTable.label(DataManager.to_display_frame(df.iloc[order[start:start + page_size]]))
+    
+    @staticmethod
+    def label(display_df: pd.DataFrame) -> pd.DataFrame:
+        """Rename table columns to their on-screen labels"""
+        return display_df.rename(columns={k: v for k, v in DataTable.COLUMN_LABELS.items() if k in display_df.columns})
+    
+    @staticmethod
+    def iter_csv(df: pd.DataFrame, order: np.ndarray, chunk_rows: int) -> Iterator[str]:
+        """CSV text for the ordered rows, formatted chunk by chunk"""
+        if not len(order):
+            yield DataManager.to_display_frame(df.iloc[:0]).to_csv(index=False)
+            return
+        for start in range(0, len(order), chunk_rows):
+            chunk = DataManager.to_display_frame(df.iloc[order[start:start + chunk_rows]])
+            yield chunk.to_csv(index=False, header=start == 0)
+
+@st.cache_resource(max_entries=16)
+def get_table_row_order(data_version: str, row_window: Optional[tuple], search: str,
+                        sort_by: Optional[str], descending: bool, _df: pd.DataFrame) -> np.ndarray:
+    """Table query results shared by every session viewing the same data version"""
+    with get_metrics().timer('table_query'):
+        return DataTable.row_order(_df, search, sort_by, descending)
+
+# st.fragment graduated from st.experimental_fragment in Streamlit 1.37
+st_fragment = getattr(st, 'fragment', None) or st.experimental_fragment
+
 # ==================== UI COMPONENTS ====================
 class UIComponents:
     """Manages all UI components and rendering"""
@@ -976,15 +3703,7 @@ class UIComponents:
     @staticmethod
     def render_header():
         """Render main header with branding"""
-        st.markdown("""
-        <div class="main-header">
-            <div class="main-title">LuxQuant VIP | 智汇尊享会</div>
-            <div class="subtitle">Tools for Automated Crypto Trading Setup 24/7</div>
-            <div class="subtitle">Help traders identify market opportunities without having to monitor charts continuously.</div>
-            <div class="accuracy-badge">⚡ 24/7 Automated Signals ⚡</div>
-            <div class="accuracy-badge" style="margin-top: 0.5rem;">Historical Accuracy of 87.9% (No Future Guarantee)</div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(HtmlTemplates.HEADER, unsafe_allow_html=True)
     
     @staticmethod
     def render_period_selector():
@@ -1001,65 +3720,89 @@ class UIComponents:
             
             period = st.radio(
                 "",
-                options=["week", "month", "all"],
-                format_func=lambda x: {"week": "📅 Last Week", "month": "📆 Last Month", "all": "📈 All Time"}[x],
+                options=list(AnalyticsEngine.PERIOD_LABELS),
+                format_func=lambda x: AnalyticsEngine.PERIOD_LABELS[x],
                 horizontal=True,
                 key="period_selector"
             )
             
+            strategy = None
+            if Config.STRATEGIES:
+                strategy = st.selectbox(
+                    "Strategy",
+                    options=[StrategyViews.COMBINED, *Config.STRATEGIES],
+                    format_func=lambda x: StrategyViews.COMBINED_LABEL if x == StrategyViews.COMBINED else x,
+                    key="strategy_selector"
+                )
+            
+            date_range = None
+            if period == 'custom':
+                today = datetime.date.today()
+                selected = st.date_input(
+                    "Date range",
+                    value=(today - datetime.timedelta(days=30), today),
+                    max_value=today,
+                    key="custom_date_range"
+                )
+                # date_input yields a single date while the range is half-picked
+                date_range = tuple(selected) if isinstance(selected, (list, tuple)) else (selected,)
+                date_range = date_range or (today,)
+            
+            st.toggle(
+                "🔍 Full-resolution charts",
+                key="full_resolution_charts",
+                help="Plot every row instead of a downsampled view on long periods"
+            )
+            
             st.markdown('<div style="margin-top: 1.5rem;"></div>', unsafe_allow_html=True)
             load_button = st.button("🚀 LOAD TRADING STATISTICS", use_container_width=True, type="primary")
             st.markdown('</div>', unsafe_allow_html=True)
         
-        return period, load_button
+        return period, date_range, strategy, load_button
     
     @staticmethod
     def render_stats_cards(stats: Dict[str, Any]):
         """Render statistics cards with completion rate instead of global users"""
         st.markdown('<h3 style="color: #F0B90B; font-size: clamp(1.2rem, 3vw, 1.8rem); font-weight: 700; margin-bottom: 1.5rem; text-align: center;">📈 Key Performance Metrics</h3>', unsafe_allow_html=True)
         
+        cards = [
+            ("📊", f"{stats['overall_winrate']:.1f}%", "Historical System<br>Accuracy (Win-Rate)"),
+            ("⚡", f"{stats['total_signals']:,}", "Total System<br>Output"),
+            ("🎯", f"{stats['total_tp']:,}", "Take Profit<br>Signals"),
+            ("✅", f"{stats['completion_rate']:.1f}%", "Completion<br>Rate"),
+        ]
+        
         # Use responsive columns
-        col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
+        for col, (icon, value, label) in zip(st.columns([1, 1, 1, 1]), cards):
+            with col:
+                st.markdown(HtmlTemplates.stat_card(icon, value, label), unsafe_allow_html=True)
+    
+    @staticmethod
+    def render_strategy_breakdown(rows: list):
+        """Render per-strategy statistics for the selected period"""
+        if not rows:
+            return
         
-        with col1:
-            st.markdown(f"""
-            <div class="stat-card">
-                <div class="stat-icon">📊</div>
-                <div class="stat-value">{stats['overall_winrate']:.1f}%</div>
-                <div class="stat-label">Historical System<br>Accuracy (Win-Rate)</div>
-            </div>
-            """, unsafe_allow_html=True)
+        st.markdown('<h3 style="color: #F0B90B; font-size: clamp(1.2rem, 3vw, 1.8rem); font-weight: 700; margin: 2rem 0 1.5rem 0; text-align: center;">🧩 Strategy Breakdown</h3>', unsafe_allow_html=True)
         
-        with col2:
-            st.markdown(f"""
-            <div class="stat-card">
-                <div class="stat-icon">⚡</div>
-                <div class="stat-value">{stats['total_signals']:,}</div>
-                <div class="stat-label">Total System<br>Output</div>
-            </div>
-            """, unsafe_allow_html=True)
+        breakdown = pd.DataFrame([{
+            '🧩 Strategy': row['strategy'],
+            '📊 Win-Rate (%)': round(row['overall_winrate'], 1),
+            '⚡ Total Signals': row['total_signals'],
+            '🎯 TP': row['total_tp'],
+            '🛑 SL': row['total_sl'],
+            '✅ Completion (%)': round(row['completion_rate'], 1),
+        } for row in rows])
         
-        with col3:
-            st.markdown(f"""
-            <div class="stat-card">
-                <div class="stat-icon">🎯</div>
-                <div class="stat-value">{stats['total_tp']:,}</div>
-                <div class="stat-label">Take Profit<br>Signals</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col4:
-            st.markdown(f"""
-            <div class="stat-card">
-                <div class="stat-icon">✅</div>
-                <div class="stat-value">{stats['completion_rate']:.1f}%</div>
-                <div class="stat-label">Completion<br>Rate</div>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    @staticmethod
-    def render_insights(stats: Dict[str, Any], filtered_df: pd.DataFrame):
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.dataframe(breakdown, use_container_width=True, hide_index=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    @staticmethod
+    def render_insights(stats: Dict[str, Any], filtered_df: pd.DataFrame,
+                        rolling: Optional[Dict[str, Any]] = None):
         """Render trading insights with enhanced readability"""
+        rolling = rolling or {}
         st.markdown('<h3 style="color: #F0B90B; font-size: clamp(1.2rem, 3vw, 1.8rem); font-weight: 700; margin: 2rem 0 1.5rem 0; text-align: center;">💡 Trading Insights</h3>', unsafe_allow_html=True)
         
         col1, col2, col3 = st.columns(3)
@@ -1079,19 +3822,24 @@ class UIComponents:
                 insight_icon = "🔴"
                 insight_text = "Needs Improvement"
             
-            st.markdown(f"""
-            <div class="stat-card">
-                <div class="stat-icon">{insight_icon}</div>
-                <div class="stat-label" style="color: {insight_color}; font-weight: 600;">{insight_text}</div>
-                <div style="font-size: clamp(0.75rem, 2vw, 0.9rem); margin-top: 0.5rem; color: #FFFFFF;">
-                    Winrate: {stats['overall_winrate']:.1f}%
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            insight_detail = f"Winrate: {stats['overall_winrate']:.1f}%"
+            st.markdown(HtmlTemplates.insight_card(insight_icon, insight_text, insight_color, insight_detail),
+                        unsafe_allow_html=True)
         
         with col2:
-            # Trend analysis
-            if len(filtered_df) >= 3 and 'Winrate_num' in filtered_df.columns:
+            # Trend analysis: last 7 days against the last 30
+            trend_detail = "Recent Performance Analysis"
+            if rolling.get('winrate_7d') is not None and rolling.get('winrate_30d') is not None:
+                trend_detail = f"7D {rolling['winrate_7d']:.1f}% vs 30D {rolling['winrate_30d']:.1f}%"
+                if rolling['winrate_7d'] > rolling['winrate_30d']:
+                    trend_icon = "📈"
+                    trend_text = "Improving Trend"
+                    trend_color = Config.COLORS['success']
+                else:
+                    trend_icon = "📉"
+                    trend_text = "Declining Trend"
+                    trend_color = Config.COLORS['danger']
+            elif len(filtered_df) >= 3 and 'Winrate_num' in filtered_df.columns:
                 recent_avg = filtered_df['Winrate_num'].tail(3).mean()
                 overall_avg = filtered_df['Winrate_num'].mean()
                 
@@ -1108,15 +3856,8 @@ class UIComponents:
                 trend_text = "Stable Performance"
                 trend_color = "#2196F3"
             
-            st.markdown(f"""
-            <div class="stat-card">
-                <div class="stat-icon">{trend_icon}</div>
-                <div class="stat-label" style="color: {trend_color}; font-weight: 600;">{trend_text}</div>
-                <div style="font-size: clamp(0.75rem, 2vw, 0.9rem); margin-top: 0.5rem; color: #FFFFFF;">
-                    Recent Performance Analysis
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(HtmlTemplates.insight_card(trend_icon, trend_text, trend_color, trend_detail),
+                        unsafe_allow_html=True)
         
         with col3:
             # Completion rate insight
@@ -1133,27 +3874,140 @@ class UIComponents:
                 completion_text = "Low Completion"
                 completion_color = Config.COLORS['danger']
             
-            st.markdown(f"""
-            <div class="stat-card">
-                <div class="stat-icon">{completion_icon}</div>
-                <div class="stat-label" style="color: {completion_color}; font-weight: 600;">{completion_text}</div>
-                <div style="font-size: clamp(0.75rem, 2vw, 0.9rem); margin-top: 0.5rem; color: #FFFFFF;">
-                    {stats['completion_rate']:.1f}% Signals Closed
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            completion_detail = f"{stats['completion_rate']:.1f}% Signals Closed"
+            st.markdown(HtmlTemplates.insight_card(completion_icon, completion_text, completion_color, completion_detail),
+                        unsafe_allow_html=True)
+        
+        if rolling:
+            UIComponents.render_rolling_insights(rolling)
+    
+    @staticmethod
+    def render_rolling_insights(rolling: Dict[str, Any]):
+        """Render streak, drawdown and volatility band cards"""
+        st.markdown('<div style="margin-top: 1rem;"></div>', unsafe_allow_html=True)
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.markdown(HtmlTemplates.insight_card(
+                "🔥",
+                f"Longest TP Streak: {rolling['longest_tp_streak']:,} days",
+                Config.COLORS['success'],
+                f"Longest SL streak: {rolling['longest_sl_streak']:,} days",
+            ), unsafe_allow_html=True)
+        
+        with col2:
+            if rolling['drawdown'] > 0:
+                drawdown_text = f"Worst Drawdown: {rolling['drawdown']:,.0f} net SL"
+                drawdown_detail = f"{rolling['drawdown_start'] or 'Undated'} → {rolling['drawdown_end'] or 'Undated'}"
+            else:
+                drawdown_text = "No Drawdown"
+                drawdown_detail = "TP never fell behind SL"
+            st.markdown(HtmlTemplates.insight_card("📉", drawdown_text, Config.COLORS['danger'], drawdown_detail),
+                        unsafe_allow_html=True)
+        
+        with col3:
+            low, high, latest = rolling.get('band_low'), rolling.get('band_high'), rolling.get('latest_winrate')
+            if low is None or high is None:
+                band_text, band_color = "Volatility Band Unavailable", Config.COLORS['text_muted']
+                band_detail = "Not enough closed signals"
+            else:
+                if latest is not None and latest > high:
+                    band_text, band_color = "Above Volatility Band", Config.COLORS['success']
+                elif latest is not None and latest < low:
+                    band_text, band_color = "Below Volatility Band", Config.COLORS['danger']
+                else:
+                    band_text, band_color = "Within Volatility Band", Config.COLORS['warning']
+                band_detail = f"30D band {low:.1f}% – {high:.1f}%"
+            st.markdown(HtmlTemplates.insight_card("〰️", band_text, band_color, band_detail),
+                        unsafe_allow_html=True)
+    
+    @staticmethod
+    @st_fragment
+    def render_paginated_table(filtered_df: pd.DataFrame):
+        """Render one page of the records with server-side search and sort
+        
+        Runs as a fragment, so paging, sorting and searching rerun only the table.
+        """
+        sortable = DataTable.sortable_columns(filtered_df)
+        col1, col2, col3 = st.columns([2, 2, 1])
+        with col1:
+            search = st.text_input("🔍 Search", key="table_search", placeholder="Date or value, e.g. 2024-05 or 87.5")
+        with col2:
+            sort_by = st.selectbox("Sort by", options=sortable, key="table_sort",
+                                   format_func=lambda col: DataTable.COLUMN_LABELS[col])
+        with col3:
+            descending = st.toggle("Newest / largest first", value=True, key="table_descending")
+        
+        order = DataTable.get_row_order(filtered_df, search, sort_by, descending)
+        page_size = Config.TABLE_PAGE_SIZE
+        pages = max(-(-len(order) // page_size), 1)
+        page = min(int(st.number_input(f"Page (of {pages:,})", min_value=1, step=1, key="table_page")), pages)
+        
+        with get_metrics().timer('table_page'):
+            page_df = DataTable.page(filtered_df, order, page, page_size)
+        
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.dataframe(page_df, use_container_width=True, height=300, hide_index=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        first = (page - 1) * page_size + 1 if len(order) else 0
+        st.caption(f"Rows {first:,}–{min(page * page_size, len(order)):,} of {len(order):,}")
+        
+        if st.button("⬇️ Prepare CSV export", key="table_export"):
+            with get_metrics().timer('table_export'):
+                csv_text = ''.join(DataTable.iter_csv(filtered_df, order, Config.TABLE_EXPORT_CHUNK_ROWS))
+            st.download_button("Download CSV", csv_text, file_name="luxquant_trading_records.csv",
+                               mime="text/csv", key="table_export_download")
+    
+    @staticmethod
+    def render_data_freshness(status: Dict[str, Any]):
+        """Render a staleness badge when serving snapshot or outdated data"""
+        if status.get('source') != 'snapshot' and not (status.get('stale') and status.get('last_error')):
+            return
+        
+        updated_at = status.get('updated_at')
+        updated_text = (datetime.datetime.fromtimestamp(updated_at).strftime('%Y-%m-%d %H:%M')
+                        if updated_at else 'an earlier session')
+        
+        if status.get('last_error'):
+            badge_text = f"⚠️ Live data unavailable — showing data from {updated_text}"
+            badge_color = Config.COLORS['danger']
+        else:
+            badge_text = f"🕒 Showing saved data from {updated_text} — refreshing in background"
+            badge_color = Config.COLORS['warning']
+        
+        st.markdown(f"""
+        <div style="text-align: center; margin: 0.5rem 0 1rem 0;">
+            <span style="border: 1px solid {badge_color}; color: {badge_color}; border-radius: 8px; padding: 0.4rem 0.9rem; font-size: clamp(0.75rem, 2vw, 0.9rem); font-weight: 600;">{badge_text}</span>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    @staticmethod
+    def render_diagnostics(metrics: Metrics, data_status: Dict[str, Any], refresher_health: Dict[str, Any],
+                           client_health: Optional[Dict[str, Any]] = None):
+        """Render per-stage latency, cache counters and the Prometheus exposition"""
+        with st.expander("🩺 Diagnostics", expanded=True):
+            stages = metrics.stage_summary()
+            if stages:
+                st.dataframe(pd.DataFrame(stages).round(2), use_container_width=True, hide_index=True)
+            else:
+                st.caption("No stages recorded in this process yet.")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.json(metrics.values())
+            with col2:
+                st.json({'data': data_status, 'refresher': refresher_health, 'clients': client_health or {}})
+            
+            exposition = metrics.to_prometheus()
+            st.code(exposition, language='text')
+            st.download_button("Download metrics.prom", exposition, file_name="metrics.prom", mime="text/plain")
     
     @staticmethod
     def render_footer():
         """Render responsive footer with better contrast"""
         st.markdown("---")
-        st.markdown("""
-        <div class='footer-container' style='text-align: center; padding: clamp(1rem, 3vw, 2rem); background: linear-gradient(135deg, rgba(255, 255, 255, 0.1) 0%, rgba(255, 255, 255, 0.05) 100%); backdrop-filter: blur(10px); border-radius: 15px; margin-top: 2rem;'>
-            <h3 style='color: #F0B90B; margin-bottom: 1rem; font-size: clamp(1.2rem, 3vw, 1.5rem);'>Ready to Start Automated Trading?</h3>
-            <p style='color: #FFFFFF; margin-bottom: 1.5rem; font-size: clamp(0.9rem, 2vw, 1rem);'>Join thousands of traders using LuxQuant VIP for automated crypto trading signals.</p>
-            <p style='color: #C7C7C7; font-size: clamp(0.8rem, 1.5vw, 0.9rem);'>Made with ❤️ by LuxQuant VIP | 智汇尊享会 | Historical accuracy does not guarantee future results</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(HtmlTemplates.FOOTER, unsafe_allow_html=True)
 
 # ==================== MAIN APPLICATION ====================
 class LuxQuantDashboard:
@@ -1187,124 +4041,156 @@ class LuxQuantDashboard:
         self.ui.render_header()
         
         # Period selector and load button
-        period, load_button = self.ui.render_period_selector()
+        period, date_range, strategy, load_button = self.ui.render_period_selector()
+        
+        # Started after the first paint: seeding the cache reads the snapshot
+        # and the refresher builds the Sheets client
+        self.data_manager.start_background_refresh()
         
         if load_button:
-            self._handle_data_loading(period)
+            self._handle_data_loading(period, date_range, strategy)
         
         # Footer only
         self.ui.render_footer()
+        
+        if self._diagnostics_requested():
+            self.ui.render_diagnostics(get_metrics(), self.data_manager.get_data_status(),
+                                       self.data_manager.get_refresher_health(),
+                                       self.data_manager.get_client_health())
+    
+    def _diagnostics_requested(self) -> bool:
+        """True when the page was opened with ?diagnostics=<DIAGNOSTICS_TOKEN>"""
+        if not Config.DIAGNOSTICS_TOKEN:
+            return False
+        supplied = st.query_params.get('diagnostics', '')
+        return hmac.compare_digest(supplied.encode('utf-8'), Config.DIAGNOSTICS_TOKEN.encode('utf-8'))
     
-    def _handle_data_loading(self, period: str):
+    def _handle_data_loading(self, period: str, date_range: Optional[tuple] = None,
+                             strategy: Optional[str] = None):
         """Handle data loading and display logic"""
-        with st.spinner("🔄 Loading trading data..."):
+        metrics = get_metrics()
+        with st.spinner("🔄 Loading trading data..."), metrics.timer('handle_data_loading'):
             try:
                 # Get and filter data
-                df = self.data_manager.get_sheet_data()
+                with metrics.timer('get_data'):
+                    data = self.data_manager.get_sheet_data()
+                    df = self.analytics.select_strategy(data, strategy)
                 
                 if df is None or df.empty:
                     st.warning("⚠️ No trading data available for the selected period.")
                     return
                 
-                filtered_df = self.analytics.filter_data_by_period(df, period)
+                with metrics.timer('filter'):
+                    filtered_df = self.analytics.filter_data_by_period(df, period, date_range)
                 
                 if filtered_df is None or filtered_df.empty:
                     st.warning("⚠️ No data available for the selected period.")
                     return
                 
+                metrics.set_gauge('rows', len(df), stage='loaded')
+                metrics.set_gauge('rows', len(filtered_df), stage='filtered')
+                
                 st.success("✅ Trading data loaded successfully!")
+                self.ui.render_data_freshness(self.data_manager.get_data_status())
                 
                 # Calculate and display statistics
-                stats = self.analytics.calculate_statistics(filtered_df)
+                with metrics.timer('statistics'):
+                    stats = self.analytics.calculate_period_statistics(df, period, date_range)
                 
                 if stats:
                     self.ui.render_stats_cards(stats)
                 
+                # Compare strategies side by side on the combined view
+                if strategy in (None, StrategyViews.COMBINED):
+                    with metrics.timer('strategy_breakdown'):
+                        self.ui.render_strategy_breakdown(
+                            self.analytics.strategy_breakdown(data, period, date_range))
+                
                 # Render charts
-                self._render_charts(filtered_df)
+                with metrics.timer('charts'):
+                    self._render_charts(df, filtered_df.attrs.get('row_window'))
                 
                 # Render data table with enhanced styling
-                self._render_data_table(filtered_df)
+                with metrics.timer('data_table'):
+                    self._render_data_table(filtered_df)
                 
                 # Render insights
                 if stats:
-                    self.ui.render_insights(stats, filtered_df)
+                    with metrics.timer('insights'):
+                        rolling = self.analytics.rolling_summary(df, filtered_df.attrs.get('row_window'))
+                        self.ui.render_insights(stats, filtered_df, rolling)
                 
             except Exception as e:
+                metrics.increment('load_errors', error=type(e).__name__)
                 st.error(f"❌ Error loading data: {str(e)}")
                 st.error(f"Debug info: {type(e).__name__}")
+            finally:
+                self._export_metrics()
+    
+    def _export_metrics(self):
+        """Refresh the Prometheus textfile, if one is configured"""
+        if not Config.METRICS_TEXTFILE_PATH:
+            return
+        try:
+            get_metrics().write_textfile(Config.METRICS_TEXTFILE_PATH)
+        except Exception as e:
+            print(f"❌ Error writing metrics textfile: {e}")
     
-    def _render_charts(self, filtered_df: pd.DataFrame):
+    def _render_charts(self, df: pd.DataFrame, row_window: Optional[tuple]):
         """Render all charts with enhanced readability"""
         st.markdown('<h3 style="color: #F0B90B; font-size: clamp(1.2rem, 3vw, 1.8rem); font-weight: 700; margin: 2rem 0 1.5rem 0; text-align: center;">📊 Performance Analytics</h3>', unsafe_allow_html=True)
         
+        variant = 'mobile' if st.session_state.get('mobile_view', False) else 'desktop'
+        full_resolution = st.session_state.get('full_resolution_charts', False)
+        
         # Combined dashboard - responsive height
-        combined_chart = self.chart_builder.create_combined_dashboard_chart(filtered_df)
+        combined_chart = self.chart_builder.get_chart('combined', df, row_window, variant, full_resolution)
         if combined_chart:
-            # Update chart for mobile responsiveness
-            combined_chart.update_layout(
-                height=600 if st.session_state.get('mobile_view', False) else 700,
-                margin=dict(l=40, r=40, t=60, b=40)
-            )
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-            st.plotly_chart(combined_chart, use_container_width=True, config={'responsive': True})
+            with get_metrics().timer('plotly_chart'):
+                st.plotly_chart(combined_chart, use_container_width=True, config={'responsive': True})
             st.markdown('</div>', unsafe_allow_html=True)
         
         # Individual charts with responsive grid
         col1, col2 = st.columns([1, 1])
         
         with col1:
-            winrate_chart = self.chart_builder.create_winrate_chart(filtered_df)
+            winrate_chart = self.chart_builder.get_chart('winrate', df, row_window, variant, full_resolution)
             if winrate_chart:
-                # Update chart for responsiveness
-                winrate_chart.update_layout(
-                    height=300 if st.session_state.get('mobile_view', False) else 350,
-                    margin=dict(l=40, r=40, t=50, b=40)
-                )
                 st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                st.plotly_chart(winrate_chart, use_container_width=True, config={'responsive': True})
+                with get_metrics().timer('plotly_chart'):
+                    st.plotly_chart(winrate_chart, use_container_width=True, config={'responsive': True})
                 st.markdown('</div>', unsafe_allow_html=True)
         
         with col2:
-            tpsl_chart = self.chart_builder.create_tpsl_chart(filtered_df)
+            tpsl_chart = self.chart_builder.get_chart('tpsl', df, row_window, variant, full_resolution)
             if tpsl_chart:
-                # Update chart for responsiveness
-                tpsl_chart.update_layout(
-                    height=300 if st.session_state.get('mobile_view', False) else 350,
-                    margin=dict(l=40, r=40, t=50, b=40)
-                )
                 st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                st.plotly_chart(tpsl_chart, use_container_width=True, config={'responsive': True})
+                with get_metrics().timer('plotly_chart'):
+                    st.plotly_chart(tpsl_chart, use_container_width=True, config={'responsive': True})
                 st.markdown('</div>', unsafe_allow_html=True)
     
     def _render_data_table(self, filtered_df: pd.DataFrame):
         """Render enhanced data table with Binance styling"""
         st.markdown('<h3 style="color: #F0B90B; font-size: clamp(1.2rem, 3vw, 1.8rem); font-weight: 700; margin: 2rem 0 1.5rem 0; text-align: center;">📋 Detailed Trading Records</h3>', unsafe_allow_html=True)
         
-        # Prepare display columns
-        display_cols = []
-        available_cols = ['Date', 'Total_Signal', 'Finished', 'TP', 'SL', 'Winrate_pct']
-        for col in available_cols:
-            if col in filtered_df.columns:
-                display_cols.append(col)
+        # Paginated mode formats and sends only the visible page
+        if Config.TABLE_PAGE_SIZE > 0 and DataTable.sortable_columns(filtered_df):
+            self.ui.render_paginated_table(filtered_df)
+            return
+        
+        # Prepare display columns, formatting dates and winrates only for the rows shown
+        table_df = DataManager.to_display_frame(filtered_df)
+        display_cols = list(table_df.columns)
         
         # Display the data table with enhanced Binance styling
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         if display_cols:
             # Create a responsive dataframe display
-            display_df = filtered_df[display_cols].copy()
+            display_df = table_df
             
             # Rename columns for better display
-            column_rename = {
-                'Date': '📅 Date',
-                'Total_Signal': '📊 Total Signal',
-                'Finished': '✅ Finished',
-                'TP': '🎯 TP',
-                'SL': '🛑 SL',
-                'Winrate_pct': '📈 Winrate'
-            }
-            
-            display_df = display_df.rename(columns={k: v for k, v in column_rename.items() if k in display_df.columns})
+            display_df = DataTable.label(display_df)
             
             # Format for better mobile display
             if len(display_df.columns) > 4:
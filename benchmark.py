@@ -0,0 +1,253 @@
+"""Benchmark the LuxQuant data pipeline on synthetic multi-year sheets.
+
+Usage:
+    python benchmark.py                       # 1k, 10k, 100k and 1M rows
+    python benchmark.py --rows 1000 10000 --output bench.json
+    python benchmark.py --import-only --import-budget-ms 1500
+"""
+import argparse
+import datetime
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Optional, Dict, Any, Callable, List
+
+import numpy as np
+import pandas as pd
+
+import app
+from loadtest import quiet_streamlit_logs
+
+quiet_streamlit_logs()
+
+DEFAULT_ROW_COUNTS = [1_000, 10_000, 100_000, 1_000_000]
+
+# ==================== IMPORT TIME ====================
+def measure_import_time(module: str = "app", top: int = 10) -> Dict[str, Any]:
+    """Import module in a fresh interpreter under -X importtime
+
+    Returns the module's cumulative import time and its slowest direct
+    imports, in milliseconds.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    entries = []
+    # Lines look like "import time:  self [us] | cumulative | <indent>imported package",
+    # printed children first, each nesting level indented by two more spaces
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        entries.append((len(name) - len(name.lstrip()), name.strip(), int(cumulative)))
+
+    total_us = None
+    imported = []
+    for position, (indent, name, cumulative) in enumerate(entries):
+        if name == module:
+            total_us = cumulative
+            # The module's dependencies are the more indented lines just above it
+            for child_indent, child, child_us in reversed(entries[:position]):
+                if child_indent <= indent:
+                    break
+                if child_indent == indent + 2:
+                    imported.append((child, child_us))
+            break
+
+    slowest = sorted(imported, key=lambda item: item[1], reverse=True)[:top]
+    return {
+        'module': module,
+        'total_ms': total_us / 1000 if total_us is not None else None,
+        'slowest': [{'name': name, 'ms': us / 1000} for name, us in slowest],
+    }
+
+# ==================== SYNTHETIC SHEET ====================
+class SyntheticSheet:
+    """Generates raw values in the exact shape returned by worksheet.get_all_values()"""
+
+    HEADER = ["Date", "Total_Signal", "Finished", "TP", "SL", "Winrate_pct"]
+
+    @staticmethod
+    def generate(rows: int, seed: int = 7, span_days: int = 3650,
+                 blank_row_rate: float = 0.01, trailing_blank_rows: int = 20) -> List[List[str]]:
+        """Build header + data rows spread over span_days, with blanks and mixed formats"""
+        rng = random.Random(seed)
+        start = datetime.date(2016, 1, 1)
+        values = [list(SyntheticSheet.HEADER)]
+
+        for i in range(rows):
+            if rng.random() < blank_row_rate:
+                values.append([""] * len(SyntheticSheet.HEADER))
+                continue
+
+            day = start + datetime.timedelta(days=i * span_days // max(rows, 1))
+            tp = rng.randint(0, 900)
+            sl = rng.randint(0, 300)
+            finished = tp + sl
+            total = finished + rng.randint(0, 200)
+            winrate = 100 * tp / finished if finished else 0
+
+            values.append([
+                SyntheticSheet._format_date(day, rng),
+                f"{total:,}",
+                str(finished),
+                str(tp),
+                str(sl),
+                f"{winrate:.1f}%",
+            ])
+
+        values.extend([""] * len(SyntheticSheet.HEADER) for _ in range(trailing_blank_rows))
+        return values
+
+    @staticmethod
+    def _format_date(day: datetime.date, rng: random.Random) -> str:
+        """Render a date in one of the formats seen in the production sheet"""
+        roll = rng.random()
+        if roll < 0.55:
+            return day.isoformat()
+        if roll < 0.75:
+            return f"{day.month}/{day.day}/{day.year}"
+        if roll < 0.88:
+            return f"{day.month:02d}-{day.day:02d}-{day.year}"
+        if roll < 0.95:
+            start = day - datetime.timedelta(days=6)
+            return f"{start.month:02d}/{start.day:02d}-{day.month:02d}/{day.day:02d}"
+        return day.strftime("%B %d, %Y")
+
+# ==================== BENCHMARK RUNNER ====================
+class BenchmarkRunner:
+    """Times each pipeline stage and records its peak traced memory"""
+
+    def __init__(self, repeat: int = 1, track_memory: bool = True):
+        self.repeat = repeat
+        self.track_memory = track_memory
+        self.results: List[Dict[str, Any]] = []
+
+    def measure(self, rows: int, stage: str, func: Callable[[], Any]) -> Any:
+        """Run func, keeping the best wall time over repeats plus one traced run for memory"""
+        timings = []
+        result = None
+        for _ in range(self.repeat):
+            gc.collect()
+            started = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - started)
+
+        peak_mb = None
+        if self.track_memory:
+            gc.collect()
+            tracemalloc.start()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            peak_mb = peak / (1024 * 1024)
+
+        self.results.append({
+            'rows': rows,
+            'stage': stage,
+            'seconds': min(timings),
+            'peak_mb': peak_mb,
+        })
+        return result
+
+    def run(self, rows: int, seed: int):
+        """Benchmark every stage from raw values to serialized figures"""
+        data_manager = app.DataManager()
+        analytics = app.AnalyticsEngine
+        charts = app.ChartBuilder
+
+        values = self.measure(rows, 'generate_values', lambda: SyntheticSheet.generate(rows, seed))
+        header_row, data_rows = values[0], values[1:]
+
+        last_index = self.measure(rows, 'find_last_data_row',
+                                  lambda: data_manager._find_last_data_row(data_rows))
+        valid_rows = data_rows[:last_index + 1]
+
+        self.measure(rows, 'hash_rows', lambda: app.DataCache.hash_rows([header_row] + valid_rows).hexdigest())
+        date_cells = np.array([row[0] for row in valid_rows if any(row[:6])], dtype=object)
+        self.measure(rows, 'parse_dates', lambda: data_manager._parse_date_cells(date_cells))
+
+        df = self.measure(rows, 'ingest_rows', lambda: data_manager._ingest_rows(header_row, valid_rows))
+        df.attrs['data_version'] = f"bench-{rows}-{seed}"
+
+        aggregates = self.measure(rows, 'period_aggregates', lambda: app.PeriodAggregates(df))
+        rolling = self.measure(rows, 'rolling_metrics', lambda: app.RollingMetrics(df))
+        self.measure(rows, 'rolling_summary', lambda: rolling.summary(0, len(df)))
+        filtered = analytics.filter_data_by_period(df, 'all')
+        self.measure(rows, 'calculate_statistics', lambda: analytics.calculate_statistics(filtered))
+        self.measure(rows, 'calculate_period_statistics', lambda: [
+            aggregates.totals(*aggregates.window_bounds(*analytics.resolve_period(period)))
+            for period in analytics.PERIOD_LABELS if period != 'custom'
+        ])
+
+        self.measure(rows, 'display_frame', lambda: app.DataManager.to_display_frame(filtered))
+        frame = self.measure(rows, 'render_frame', lambda: app.RenderFrame.from_dataframe(df))
+        budget = app.Config.CHART_POINT_BUDGET
+        self.measure(rows, 'winrate_chart', lambda: charts.create_winrate_chart(frame, budget))
+        self.measure(rows, 'tpsl_chart', lambda: charts.create_tpsl_chart(frame, budget))
+        combined = self.measure(rows, 'combined_chart', lambda: charts.create_combined_dashboard_chart(frame, budget))
+        self.measure(rows, 'combined_chart_json', lambda: combined.to_json())
+
+    def report(self) -> Dict[str, Any]:
+        """Machine-readable report of every measurement"""
+        return {
+            'generated_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'repeat': self.repeat,
+            'results': self.results,
+        }
+
+    def print_table(self):
+        """Human-readable summary on stdout"""
+        print(f"{'rows':>10}  {'stage':<28} {'seconds':>10} {'peak MB':>10}")
+        for result in self.results:
+            peak = f"{result['peak_mb']:.1f}" if result['peak_mb'] is not None else '-'
+            print(f"{result['rows']:>10,}  {result['stage']:<28} {result['seconds']:>10.4f} {peak:>10}")
+
+# ==================== ENTRY POINT ====================
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the LuxQuant data pipeline")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROW_COUNTS,
+                        help="Sheet sizes to benchmark")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per stage (best is kept)")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for the synthetic sheet")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--import-only", action="store_true", help="Only measure the cold import of app.py")
+    parser.add_argument("--import-budget-ms", type=float,
+                        help="Exit with status 1 when importing app.py takes longer than this")
+    args = parser.parse_args(argv)
+
+    runner = BenchmarkRunner(repeat=args.repeat, track_memory=not args.no_memory)
+    if not args.import_only:
+        for rows in args.rows:
+            runner.run(rows, args.seed)
+
+    report = runner.report()
+    report['import_time'] = measure_import_time()
+    if args.output:
+        runner.print_table()
+        print(f"import app: {report['import_time']['total_ms']:.1f} ms")
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    import_ms = report['import_time']['total_ms']
+    if args.import_budget_ms is not None and import_ms is not None and import_ms > args.import_budget_ms:
+        print(f"import app took {import_ms:.1f} ms, over the {args.import_budget_ms:.0f} ms budget", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
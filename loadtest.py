@@ -0,0 +1,247 @@
+"""End-to-end load test of the dashboard against the offline fake Sheets backend.
+
+Each simulated session runs the real app script through Streamlit's AppTest
+harness, picks a period and clicks the load button, so the measured latency
+covers _handle_data_loading plus chart and table rendering. AppTest is not
+thread-safe, so concurrent sessions run in worker processes; each worker has
+its own process-wide caches, like one replica of a multi-replica deployment.
+
+--mode thread instead drives every session from a thread of this process, so
+they all share one set of process-wide caches (data cache, single-flight,
+refresher, metrics) the way sessions of a single `streamlit run` server do.
+Each session builds its own LuxQuantDashboard and calls _handle_data_loading
+directly; any error it shows on the page counts as a failed load.
+
+The exit status is non-zero when any load failed.
+
+Usage:
+    python loadtest.py --sessions 50 --loads 4 --rows 20000 --latency 0.8 --error-rate 0.05
+    python loadtest.py --mode thread --sessions 100 --loads 4 --latency 0.8
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+APP_PATH = str(Path(__file__).parent / "app.py")
+
+# ==================== SESSION SIMULATION ====================
+def quiet_streamlit_logs():
+    """Sessions execute app code outside `streamlit run`; keep its warnings out of the report"""
+    for logger_name in list(logging.root.manager.loggerDict):
+        if logger_name.startswith("streamlit"):
+            logging.getLogger(logger_name).setLevel(logging.ERROR)
+
+def run_session(session_id: int, loads: int, periods: List[str], timeout: float) -> List[Dict[str, Any]]:
+    """Open one dashboard session and press the load button `loads` times"""
+    from streamlit.testing.v1 import AppTest
+
+    quiet_streamlit_logs()
+
+    rng = random.Random(session_id)
+    samples = []
+    app_test = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    app_test.run()
+
+    for _ in range(loads):
+        period = rng.choice(periods)
+        started = time.perf_counter()
+        try:
+            app_test.radio(key="period_selector").set_value(period).run()
+            app_test.button[0].click().run()
+            failed = bool(app_test.exception) or not app_test.success
+            error = app_test.exception[0].value if app_test.exception else None
+        except Exception as e:
+            failed, error = True, str(e)
+        samples.append({
+            'session': session_id,
+            'period': period,
+            'seconds': time.perf_counter() - started,
+            'failed': failed,
+            'error': error,
+        })
+    return samples
+
+class PageErrors:
+    """Records st.error calls per thread, so threaded sessions can tell which loads failed"""
+    
+    _local = threading.local()
+    _installed = False
+    _install_lock = threading.Lock()
+    
+    @classmethod
+    def install(cls):
+        """Wrap st.error once; the original call still runs"""
+        import streamlit as st
+        with cls._install_lock:
+            if cls._installed:
+                return
+            original = st.error
+            
+            def recording_error(body, *args, **kwargs):
+                messages = getattr(cls._local, 'messages', None)
+                if messages is not None:
+                    messages.append(str(body))
+                return original(body, *args, **kwargs)
+            
+            st.error = recording_error
+            cls._installed = True
+    
+    @classmethod
+    def capture(cls) -> List[str]:
+        """Start collecting this thread's errors into the returned list"""
+        cls._local.messages = []
+        return cls._local.messages
+
+def run_threaded_session(session_id: int, loads: int, periods: List[str],
+                         start: threading.Barrier) -> List[Dict[str, Any]]:
+    """Run one session's loads in this thread against the process-wide caches"""
+    rng = random.Random(session_id)
+    samples = []
+    try:
+        import app
+        # A fresh dashboard per session, as every script rerun builds one
+        dashboard = app.LuxQuantDashboard()
+        dashboard.data_manager.start_background_refresh()
+    except Exception:
+        # Release the other sessions instead of leaving them at the barrier
+        start.abort()
+        raise
+    start.wait()
+
+    for _ in range(loads):
+        period = rng.choice(periods)
+        errors = PageErrors.capture()
+        started = time.perf_counter()
+        try:
+            dashboard._handle_data_loading(period)
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+        samples.append({
+            'session': session_id,
+            'period': period,
+            'seconds': time.perf_counter() - started,
+            'failed': bool(errors),
+            'error': errors[0] if errors else None,
+        })
+    return samples
+
+def run_threaded(sessions: int, loads: int, periods: List[str]) -> List[Dict[str, Any]]:
+    """Drive all sessions concurrently from threads sharing this process's caches"""
+    quiet_streamlit_logs()
+    PageErrors.install()
+    # Sessions start loading together so cold misses actually coalesce
+    start = threading.Barrier(sessions)
+    with ThreadPoolExecutor(max_workers=sessions, thread_name_prefix="session") as pool:
+        futures = [
+            pool.submit(run_threaded_session, session_id, loads, periods, start)
+            for session_id in range(sessions)
+        ]
+        return [sample for future in futures for sample in future.result()]
+
+def run_processes(sessions: int, loads: int, periods: List[str], timeout: float) -> List[Dict[str, Any]]:
+    """Run each session through AppTest in its own worker process"""
+    with ProcessPoolExecutor(max_workers=sessions) as pool:
+        futures = [
+            pool.submit(run_session, session_id, loads, periods, timeout)
+            for session_id in range(sessions)
+        ]
+        return [sample for future in futures for sample in future.result()]
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def summarize(samples: List[Dict[str, Any]], wall_seconds: float) -> Dict[str, Any]:
+    """Latency percentiles, throughput and error counts"""
+    latencies = [s['seconds'] for s in samples if not s['failed']]
+    return {
+        'loads': len(samples),
+        'failed': sum(s['failed'] for s in samples),
+        'wall_seconds': wall_seconds,
+        'throughput_per_second': len(samples) / wall_seconds if wall_seconds else None,
+        'latency_seconds': {
+            'mean': statistics.fmean(latencies) if latencies else None,
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'max': max(latencies) if latencies else None,
+        },
+        'errors': sorted({s['error'] for s in samples if s['error']}),
+    }
+
+# ==================== ENTRY POINT ====================
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Load test the dashboard against a fake Sheets backend")
+    parser.add_argument("--mode", choices=["process", "thread"], default="process",
+                        help="Run sessions in worker processes via AppTest, or as threads sharing one process")
+    parser.add_argument("--sessions", type=int, default=20, help="Concurrent simulated sessions")
+    parser.add_argument("--loads", type=int, default=3, help="Load-button clicks per session")
+    parser.add_argument("--periods", nargs="+", default=["week", "month", "all"], help="Periods to pick from")
+    parser.add_argument("--rows", type=int, default=5_000, help="Rows in the generated fake sheet")
+    parser.add_argument("--sheet", help="Existing CSV/JSON sheet to serve instead of a generated one")
+    parser.add_argument("--latency", type=float, default=0.5, help="Simulated Sheets read latency (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Latency jitter (+/- seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability a read raises a quota error")
+    parser.add_argument("--growth", type=int, default=0, help="Rows appended to the fake sheet per read")
+    parser.add_argument("--timeout", type=float, default=120, help="Per-rerun timeout (seconds)")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    sheet_path = args.sheet
+    if not sheet_path:
+        from benchmark import SyntheticSheet
+        sheet_path = os.path.join(tempfile.mkdtemp(prefix="luxquant-loadtest-"), "sheet.json")
+        with open(sheet_path, "w") as f:
+            json.dump(SyntheticSheet.generate(args.rows), f)
+
+    # Config is read when the app script executes, so the environment must be set first
+    os.environ.update({
+        "DATA_SOURCE": "fake",
+        "FAKE_SHEET_PATH": sheet_path,
+        "FAKE_SHEET_LATENCY": str(args.latency),
+        "FAKE_SHEET_LATENCY_JITTER": str(args.jitter),
+        "FAKE_SHEET_ERROR_RATE": str(args.error_rate),
+        "FAKE_SHEET_GROWTH_ROWS": str(args.growth),
+        "SNAPSHOT_PATH": os.environ.get("SNAPSHOT_PATH", ""),
+        "STREAMLIT_LOGGER_LEVEL": "error",
+    })
+    started = time.perf_counter()
+    if args.mode == "thread":
+        samples = run_threaded(args.sessions, args.loads, args.periods)
+    else:
+        samples = run_processes(args.sessions, args.loads, args.periods, args.timeout)
+    wall_seconds = time.perf_counter() - started
+
+    report = {
+        'config': vars(args) | {'sheet': sheet_path},
+        'summary': summarize(samples, wall_seconds),
+        'samples': samples,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(json.dumps(report['summary'], indent=2))
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if report['summary']['failed']:
+        print(f"❌ {report['summary']['failed']} of {len(samples)} loads failed", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,10 @@
+"""Shared test setup."""
+import pytest
+
+from loadtest import quiet_streamlit_logs
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _quiet_streamlit():
+    """Tests run app code outside `streamlit run`; keep its context warnings out of the output"""
+    quiet_streamlit_logs()
@@ -0,0 +1,119 @@
+"""Concurrency tests for the process-wide data cache."""
+import threading
+import time
+
+import pandas as pd
+
+import app
+
+
+def _run_concurrently(target, count):
+    """Start count threads on target together; return their results and errors"""
+    barrier = threading.Barrier(count)
+    results, errors = [], []
+
+    def worker():
+        barrier.wait()
+        try:
+            results.append(target())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+    return results, errors
+
+
+def test_concurrent_misses_share_one_load():
+    loads = []
+    frame = pd.DataFrame({'TP': [1, 2, 3]})
+
+    def loader(entry):
+        loads.append(entry)
+        time.sleep(0.2)
+        return {'df': frame, 'content_hash': 'v1'}
+
+    cache = app.DataCache(ttl=300, stale_ttl=300)
+    results, errors = _run_concurrently(lambda: cache.get(loader), 16)
+
+    assert errors == []
+    assert len(results) == 16
+    assert all(result is frame for result in results)
+    assert len(loads) == 1
+    assert cache._flight._calls == {}
+
+
+def test_failed_load_reaches_every_waiter_and_clears():
+    def loader(entry):
+        time.sleep(0.2)
+        raise RuntimeError("sheet unavailable")
+
+    cache = app.DataCache(ttl=300, stale_ttl=300)
+    results, errors = _run_concurrently(lambda: cache.get(loader), 8)
+
+    assert results == []
+    assert len(errors) == 8
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert cache._flight._calls == {}
+    assert cache.status()['last_error'] == "sheet unavailable"
+
+
+def test_refresh_during_concurrent_gets():
+    frame = pd.DataFrame({'TP': [1]})
+    cache = app.DataCache(ttl=300, stale_ttl=300)
+
+    def loader(entry):
+        time.sleep(0.05)
+        return {'df': frame, 'content_hash': 'v1'}
+
+    def get_or_refresh():
+        cache.refresh(loader)
+        return cache.get(loader)
+
+    results, errors = _run_concurrently(get_or_refresh, 8)
+
+    assert errors == []
+    assert all(result is frame for result in results)
+
+
+def test_failed_revalidation_backs_off():
+    frame = pd.DataFrame({'TP': [1]})
+    attempts = []
+
+    def good_loader(entry):
+        return {'df': frame, 'content_hash': 'v1'}
+
+    def failing_loader(entry):
+        attempts.append(entry)
+        raise RuntimeError("sheet unavailable")
+
+    cache = app.DataCache(ttl=0, stale_ttl=300, retry_backoff=60)
+    assert cache.get(good_loader) is frame
+
+    # The first stale read revalidates in the background and fails
+    assert cache.get(failing_loader) is frame
+    deadline = time.monotonic() + 5
+    while (not attempts or cache._refreshing) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # Later stale reads keep serving the entry without hitting the source again
+    for _ in range(10):
+        assert cache.get(failing_loader) is frame
+    time.sleep(0.1)
+
+    assert len(attempts) == 1
+    assert cache.status()['consecutive_failures'] == 1
+
+
+def test_empty_read_keeps_previous_entry():
+    frame = pd.DataFrame({'TP': [1]})
+    cache = app.DataCache(ttl=0, stale_ttl=0)
+    assert cache.get(lambda entry: {'df': frame, 'content_hash': 'v1'}) is frame
+
+    # A header-only sheet is a failed load, not a replacement for good data
+    assert cache.get(lambda entry: {'df': None}) is frame
+    assert cache._entry['content_hash'] == 'v1'
+    assert cache.status()['consecutive_failures'] == 1
@@ -0,0 +1,75 @@
+"""Parsing of raw sheet rows into the compact typed frame."""
+import datetime
+import re
+
+import numpy as np
+import pandas as pd
+
+import app
+
+
+def test_count_outside_int32_is_not_wrapped():
+    header = ['Date', 'Total Signal', 'Finished', 'TP', 'SL', 'Winrate']
+    rows = [
+        ['2024-01-01', '12', '10', '8', '2', '80%'],
+        ['2024-01-02', '1704067200000', '10', '8', '2', '80%'],
+    ]
+
+    df = app.DataManager()._ingest_rows(header, rows)
+
+    assert df['Total_Signal'].tolist() == [12, 0]
+    assert df['Total_Signal'].dtype == 'int32'
+    assert app.DataManager._parse_count(2 ** 31) is None
+    assert app.DataManager._parse_count(2 ** 31 - 1) == 2 ** 31 - 1
+
+
+def _parse_date_string(date_str, idx, total_rows):
+    """The per-cell parser the vectorized one replaced, kept as the reference"""
+    range_pattern = re.search(r'(\d{2})/(\d{2})-(\d{2})/(\d{2})', date_str)
+    if range_pattern:
+        _, _, end_month, end_day = range_pattern.groups()
+        try:
+            return pd.to_datetime(f"{datetime.datetime.now().year}-{end_month}-{end_day}", format='%Y-%m-%d')
+        except ValueError:
+            pass
+    date_patterns = [
+        r'(\d{4})-(\d{1,2})-(\d{1,2})',
+        r'(\d{1,2})/(\d{1,2})/(\d{4})',
+        r'(\d{1,2})-(\d{1,2})-(\d{4})',
+    ]
+    for pattern in date_patterns:
+        match = re.search(pattern, date_str)
+        if match:
+            if pattern == date_patterns[0]:
+                year, month, day = match.groups()
+            else:
+                month, day, year = match.groups()
+            try:
+                return pd.to_datetime(f"{year}-{month}-{day}", format='%Y-%m-%d')
+            except ValueError:
+                continue
+    parsed_date = pd.to_datetime(date_str, errors='coerce')
+    if not pd.isna(parsed_date):
+        return parsed_date
+    return datetime.datetime.now() - pd.Timedelta(days=total_rows - idx - 1)
+
+
+def test_vectorized_dates_match_per_cell_parser():
+    cells = ['05/01-05/07', '2024-03-09', '2024-3-9', '3/9/2024', '03-09-2024',
+             'Mar 9 2024', 'not a date', '2024-13-45', '3/9/2024']
+
+    parsed = app.DataManager()._parse_date_cells(np.array(cells, dtype=object))
+
+    expected = [_parse_date_string(cell, idx, len(cells)) for idx, cell in enumerate(cells)]
+    assert [pd.Timestamp(value).date() for value in parsed] == [pd.Timestamp(value).date() for value in expected]
+
+
+def test_mixed_utc_offsets_fall_back_without_error():
+    cells = ['Mar 9 2024 10:00 +0200', 'Mar 10 2024 10:00 -0500', '']
+
+    parsed = app.DataManager()._parse_date_cells(np.array(cells, dtype=object))
+
+    assert parsed.dtype == 'datetime64[ns]'
+    assert pd.Timestamp(parsed[0]) == pd.Timestamp('2024-03-09 08:00')
+    assert pd.Timestamp(parsed[1]) == pd.Timestamp('2024-03-10 15:00')
+    assert pd.isna(parsed[2])
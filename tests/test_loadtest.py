@@ -0,0 +1,20 @@
+"""Threaded load test: many sessions sharing one process's caches."""
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_threaded_sessions_share_caches_without_errors(tmp_path):
+    # A separate interpreter, since Config reads the fake-source environment at import
+    result = subprocess.run(
+        [sys.executable, str(ROOT / "loadtest.py"), "--mode", "thread",
+         "--sessions", "16", "--loads", "3", "--rows", "2000",
+         "--latency", "0.05", "--jitter", "0.02",
+         "--output", str(tmp_path / "report.json")],
+        cwd=ROOT, capture_output=True, text=True, timeout=600,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert '"failed": 0' in result.stdout
@@ -0,0 +1,51 @@
+"""Lifecycle tests for the pooled Sheets client."""
+import asyncio
+import threading
+import time
+
+import app
+
+
+class StubAuth:
+    """The slice of ClientManager a SheetsClient talks to"""
+
+    def __init__(self):
+        self.replacement = None
+
+    def sheets_client(self):
+        return self.replacement
+
+    def report_failure(self, error):
+        pass
+
+
+def test_retired_client_finishes_inflight_and_reroutes_new_requests():
+    auth = StubAuth()
+    old = app.SheetsClient(auth)
+    auth.replacement = app.SheetsClient(auth)
+    started = threading.Event()
+    results = []
+
+    async def slow(client):
+        started.set()
+        await asyncio.sleep(0.2)
+        return client
+
+    async def which(client):
+        return client
+
+    caller = threading.Thread(target=lambda: results.append(old.run(slow)))
+    caller.start()
+    assert started.wait(5)
+
+    # A reconnect retires the client while a caller still holds it
+    old.close()
+    assert old.run(which) is auth.replacement
+
+    caller.join(5)
+    assert results == [old]
+    deadline = time.monotonic() + 5
+    while not old._loop.is_closed() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert old._loop.is_closed()
+    auth.replacement.close()